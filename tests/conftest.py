@@ -0,0 +1,129 @@
+"""Shared pytest configuration for the securemtr tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+# Ensure the integration package can be imported without installation.
+PROJECT_ROOT = str(Path(__file__).resolve().parents[1])
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from custom_components.securemtr import (  # noqa: E402
+    DOMAIN,
+    SecuremtrController,
+    SecuremtrRuntimeData,
+)
+
+# Identity-only stand-ins; the stub backends just record what they receive.
+_SENTINEL_SESSION: Any = object()
+_SENTINEL_WEBSOCKET: Any = object()
+
+# Shared by every runtime built here; waiting on a set Event never binds a loop.
+# Timeout tests swap in a fresh asyncio.Event() rather than clearing this one.
+_CONTROLLER_READY = asyncio.Event()
+_CONTROLLER_READY.set()
+
+# Tests drop the controller by reassigning runtime.controller, never by mutating it.
+_CONTROLLER = SecuremtrController(
+    identifier="controller-1",
+    name="E7+ Smart Water Heater Controller",
+    gateway_id="gateway-1",
+    serial_number="serial-1",
+    firmware_version="1.0.0",
+    model="E7+",
+)
+
+
+@pytest.fixture
+def make_runtime() -> Callable[..., SecuremtrRuntimeData]:
+    """Return a factory for runtime data with a connected, ready controller."""
+
+    def _factory(backend: Any, **overrides: Any) -> SecuremtrRuntimeData:
+        """Build runtime data around the backend and apply field overrides."""
+
+        runtime = SecuremtrRuntimeData(
+            backend=backend, controller_ready=_CONTROLLER_READY
+        )
+        runtime.session = _SENTINEL_SESSION
+        runtime.websocket = _SENTINEL_WEBSOCKET
+        runtime.controller = _CONTROLLER
+        for name, value in overrides.items():
+            setattr(runtime, name, value)
+        return runtime
+
+    return _factory
+
+
+@pytest.fixture
+def runtime(
+    make_runtime: Callable[..., SecuremtrRuntimeData],
+) -> SecuremtrRuntimeData:
+    """Return a ready runtime with a bare backend; modules override this as needed."""
+
+    return make_runtime(object())
+
+
+@pytest.fixture
+def entry() -> SimpleNamespace:
+    """Return a config entry stub carrying only the entry_id platforms read."""
+
+    return SimpleNamespace(entry_id="entry")
+
+
+@pytest.fixture
+def fake_hass() -> SimpleNamespace:
+    """Return a stand-in for entity.hass that entities only pass to patched helpers."""
+
+    return SimpleNamespace(data={})
+
+
+@pytest.fixture
+def runtime_hass(
+    runtime: SecuremtrRuntimeData, entry: SimpleNamespace
+) -> SimpleNamespace:
+    """Return a hass stub exposing the runtime fixture under the entry."""
+
+    return SimpleNamespace(data={DOMAIN: {entry.entry_id: runtime}})
+
+
+@pytest.fixture
+def discard_entities() -> Callable[[Iterable[Any]], None]:
+    """Return an add-entities callback for setup calls expected to fail."""
+
+    def _discard(new_entities: Iterable[Any]) -> None:
+        """Accept and drop the entities handed over by platform setup."""
+
+    return _discard
+
+
+@pytest.fixture
+def patch_dispatcher(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Callable[[Any, type], list[tuple[object, str, Any]]]:
+    """Return an installer that records a platform's dispatcher registrations."""
+
+    def _install(platform: Any, entity_cls: type) -> list[tuple[object, str, Any]]:
+        """Patch the platform's dispatcher and skip the base entity hook."""
+
+        connections: list[tuple[object, str, Any]] = []
+
+        def _connect(hass_obj: object, signal: str, callback: Any) -> Any:
+            connections.append((hass_obj, signal, callback))
+            return lambda: None
+
+        async def _fake_added(self: Any) -> None:
+            return None
+
+        monkeypatch.setattr(platform, "async_dispatcher_connect", _connect)
+        monkeypatch.setattr(entity_cls, "async_added_to_hass", _fake_added)
+        return connections
+
+    return _install
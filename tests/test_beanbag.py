@@ -2,18 +2,12 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-import sys
 from typing import Any
 from unittest.mock import AsyncMock, Mock
 
 import pytest
 from aiohttp import ClientSession
 
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
-
 from custom_components.securemtr.beanbag import BeanbagHttpClient, BeanbagLoginError
 
 
@@ -36,7 +30,6 @@ def _mock_response(
     return response
 
 
-@pytest.mark.asyncio
 async def test_login_rejects_non_json_response() -> None:
     """Ensure a non-JSON response raises a BeanbagLoginError."""
 
@@ -49,7 +42,6 @@ async def test_login_rejects_non_json_response() -> None:
         await client.login("user@example.com", "0" * 32)
 
 
-@pytest.mark.asyncio
 async def test_login_trims_email_and_filters_gateways() -> None:
     """Verify login trims the email and ignores malformed gateways."""
 
@@ -83,7 +75,6 @@ async def test_login_trims_email_and_filters_gateways() -> None:
     assert payload["ULC"]["UEI"] == "user@example.com"
 
 
-@pytest.mark.asyncio
 async def test_login_handles_non_iterable_gateways_field() -> None:
     """Ensure non-iterable gateway collections do not break login."""
 
@@ -2,19 +2,15 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Any
-import sys
+from collections import deque
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, NamedTuple
 from unittest.mock import AsyncMock, Mock
 
 import pytest
-from aiohttp import ClientConnectionResetError, ClientError
-
-# Ensure the integration package can be imported without installation.
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
+from aiohttp import ClientConnectionResetError, ClientError, ClientSession
 
+from custom_components.securemtr import beanbag
 from custom_components.securemtr.beanbag import (
     BeanbagBackend,
     BeanbagHttpClient,
@@ -29,80 +25,173 @@ from custom_components.securemtr.beanbag import (
 )
 
 
-class DummyResponse:
-    """Provide an async context manager wrapper for HTTP responses."""
+# Placeholder for constructor arguments the code under test never touches.
+_UNUSED_SESSION: Any = object()
+
+_VALID_EMAIL = "user@example.com"
+_VALID_DIGEST = "0123456789abcdef0123456789abcdef"
+
+# Canned login responses; the client only reads them, so tests share one copy.
+_LOGIN_OK_PAYLOAD: dict[str, Any] = {
+    "RI": "1",
+    "D": {
+        "UI": 77,
+        "SI": 12345,
+        "JT": "token-abc",
+        "JTT": "not-int",
+        "GD": [
+            {
+                "GMI": "gateway-1",
+                "SN": 1001,
+                "HN": "host-name",
+                "CS": 4,
+                "UR": 1,
+            }
+        ],
+    },
+}
+_LOGIN_MINIMAL_PAYLOAD: dict[str, Any] = {
+    "RI": "1",
+    "D": {"UI": 5, "SI": 6, "JT": "jwt-token"},
+}
+
+# Unused transition slot; kept a plain dict so the parser treats it as a sentinel.
+_EMPTY_TRANSITION: dict[str, int] = {"O": 65535, "T": 255}
+
+# A day without transitions and a week of them; DailyProgram values are never mutated.
+_EMPTY_DAY = DailyProgram((None, None, None), (None, None, None))
+_EMPTY_WEEK = (_EMPTY_DAY,) * 7
+
+# Correlation id produced for session "abc" with randbits patched to 1.
+_EXPECTED_CORRELATION = "abc-00000001"
+_EXPECTED_WS_HEADERS = MappingProxyType(
+    {
+        "Authorization": "Bearer jwt",
+        "Session-id": "abc",
+        "Request-id": "1",
+    }
+)
+_LIVE_STATE_REPLY: dict[str, Any] = {
+    "I": _EXPECTED_CORRELATION,
+    "R": {
+        "V": [
+            {"SI": 33, "V": [{"I": 6, "V": 0}]},
+            {
+                "SI": 16,
+                "V": [
+                    {"I": 4, "V": 1},
+                    {"I": 9, "V": 600},
+                    {"I": 27, "V": 1},
+                ],
+            },
+        ]
+    },
+}
+
+
+class FakeDay(NamedTuple):
+    """Stand in for DailyProgram without its transition validation."""
 
-    def __init__(self, status: int, payload: dict[str, Any]) -> None:
-        self.status = status
-        self._payload = payload
+    on_minutes: tuple[int | None, ...]
+    off_minutes: tuple[int | None, ...]
 
-    async def json(self, content_type: str | None = None) -> dict[str, Any]:
-        """Return the stored JSON payload."""
 
-        return self._payload
+class FakeWebSocket:
+    """Record sent frames and replay canned replies for WebSocket tests."""
 
-    async def __aenter__(self) -> "DummyResponse":
-        """Enter the async context manager."""
+    def __init__(self, responses: list[Any]) -> None:
+        self.sent: list[dict[str, Any]] = []
+        self._responses = deque(responses)
 
-        return self
+    async def send_json(self, payload: dict[str, Any]) -> None:
+        """Record the transmitted payload."""
 
-    async def __aexit__(self, exc_type, exc, tb) -> None:
-        """Exit the async context manager."""
+        self.sent.append(payload)
 
-        return None
+    async def receive_json(self) -> Any:
+        """Return the next canned reply."""
 
+        return self._responses.popleft()
 
-def test_daily_program_coerce_triplet_length_error() -> None:
-    """Validate that triplets must include exactly three entries."""
 
-    with pytest.raises(ValueError):
-        DailyProgram._coerce_triplet((30, 60), "on")
+def json_response(status: int, payload: dict[str, Any]) -> AsyncMock:
+    """Return an async context manager yielding a canned JSON response."""
 
+    response = AsyncMock()
+    response.__aenter__.return_value = SimpleNamespace(
+        status=status, json=AsyncMock(return_value=payload)
+    )
+    return response
 
-def test_daily_program_coerce_triplet_type_error() -> None:
-    """Require minute values to be integers when present."""
 
-    with pytest.raises(TypeError):
-        DailyProgram._coerce_triplet((30, "60", None), "on")
+def _post_response(session: Mock, status: int, payload: dict[str, Any]) -> None:
+    """Make the session's POST return a canned login response."""
 
+    session.post = Mock(return_value=json_response(status, payload))
 
-def test_daily_program_coerce_triplet_range_error() -> None:
-    """Reject minute values outside the 24-hour window."""
 
-    with pytest.raises(ValueError):
-        DailyProgram._coerce_triplet((1500, None, None), "on")
+@pytest.fixture
+def mock_session() -> Mock:
+    """Return an aiohttp session double for the HTTP and WebSocket client tests."""
 
+    return Mock(spec=ClientSession)
 
-@pytest.mark.asyncio
-async def test_login_success_parses_payload() -> None:
-    """Verify the login flow parses the documented response structure."""
 
-    session = Mock()
-    payload = {
-        "RI": "1",
-        "D": {
-            "UI": 77,
-            "SI": 12345,
-            "JT": "token-abc",
-            "JTT": "not-int",
-            "GD": [
-                {
-                    "GMI": "gateway-1",
-                    "SN": 1001,
-                    "HN": "host-name",
-                    "CS": 4,
-                    "UR": 1,
-                }
-            ],
-        },
-    }
-    session.post = Mock(return_value=DummyResponse(200, payload))
+@pytest.fixture
+def http_client(mock_session: Mock) -> BeanbagHttpClient:
+    """Return an HTTP client bound to the test's session double."""
+
+    return BeanbagHttpClient(mock_session)
+
 
-    client = BeanbagHttpClient(session)
-    session_data = await client.login(
-        "user@example.com", "0123456789abcdef0123456789abcdef"
+@pytest.fixture(autouse=True)
+def deterministic_beanbag(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Pin the correlation id randomness and clock used by request helpers."""
+
+    monkeypatch.setattr(beanbag.secrets, "randbits", lambda bits: 1)
+    monkeypatch.setattr(beanbag.time, "time", lambda: 1000)
+
+
+@pytest.fixture(scope="module")
+def session_data() -> BeanbagSession:
+    """Return the authenticated session shared by the backend tests."""
+
+    return BeanbagSession(
+        user_id=1,
+        session_id="abc",
+        token="jwt",
+        token_timestamp=None,
+        gateways=(),
     )
 
+
+@pytest.mark.parametrize(
+    ("values", "error"),
+    [
+        ((30, 60), ValueError),
+        ((30, "60", None), TypeError),
+        ((1500, None, None), ValueError),
+    ],
+    ids=["length", "type", "range"],
+)
+def test_daily_program_coerce_triplet_rejects_invalid(
+    values: tuple[Any, ...], error: type[Exception]
+) -> None:
+    """Reject triplets with the wrong length, non-integer or out-of-range minutes."""
+
+    with pytest.raises(error):
+        DailyProgram._coerce_triplet(values, "on")
+
+
+async def test_login_success_parses_payload(
+    mock_session: Mock, http_client: BeanbagHttpClient
+) -> None:
+    """Verify the login flow parses the documented response structure."""
+
+    _post_response(mock_session, 200, _LOGIN_OK_PAYLOAD)
+
+    session_data = await http_client.login(_VALID_EMAIL, _VALID_DIGEST)
+
     assert isinstance(session_data, BeanbagSession)
     assert session_data.user_id == 77
     assert session_data.session_id == "12345"
@@ -115,603 +204,249 @@ async def test_login_success_parses_payload() -> None:
     assert gateway.host_name == "host-name"
     assert gateway.capabilities == {"CS": 4, "UR": 1}
 
-    session.post.assert_called_once()
-    _, kwargs = session.post.call_args
+    assert mock_session.post.call_count == 1
+    _, kwargs = mock_session.post.call_args
     assert kwargs["headers"] == {"Request-id": "1"}
-    assert kwargs["json"]["ULC"]["UEI"] == "user@example.com"
+    assert kwargs["json"]["ULC"]["UEI"] == _VALID_EMAIL
 
 
-@pytest.mark.asyncio
-async def test_login_rejects_empty_email() -> None:
+async def test_login_rejects_empty_email(http_client: BeanbagHttpClient) -> None:
     """Ensure an empty email raises a validation error."""
 
-    client = BeanbagHttpClient(Mock())
-
     with pytest.raises(ValueError):
-        await client.login("", "0123456789abcdef0123456789abcdef")
+        await http_client.login("", _VALID_DIGEST)
 
 
-@pytest.mark.asyncio
-async def test_login_rejects_invalid_digest() -> None:
+async def test_login_rejects_invalid_digest(http_client: BeanbagHttpClient) -> None:
     """Ensure an invalid digest string is rejected."""
 
-    client = BeanbagHttpClient(Mock())
-
     with pytest.raises(ValueError):
-        await client.login("user@example.com", "bad-digest")
+        await http_client.login(_VALID_EMAIL, "bad-digest")
 
 
-@pytest.mark.asyncio
-async def test_login_handles_http_error() -> None:
+async def test_login_handles_http_error(
+    mock_session: Mock, http_client: BeanbagHttpClient
+) -> None:
     """Translate aiohttp failures into BeanbagLoginError."""
 
-    session = Mock()
-    session.post = Mock(side_effect=ClientError("boom"))
-    client = BeanbagHttpClient(session)
+    mock_session.post = Mock(side_effect=ClientError("boom"))
 
     with pytest.raises(BeanbagLoginError):
-        await client.login("user@example.com", "0123456789abcdef0123456789abcdef")
+        await http_client.login(_VALID_EMAIL, _VALID_DIGEST)
 
 
-@pytest.mark.asyncio
-async def test_login_rejects_unexpected_status() -> None:
+async def test_login_rejects_unexpected_status(
+    mock_session: Mock, http_client: BeanbagHttpClient
+) -> None:
     """Raise when the login response code is not HTTP 200."""
 
-    session = Mock()
-    session.post = Mock(return_value=DummyResponse(500, {"RI": "0"}))
-    client = BeanbagHttpClient(session)
+    _post_response(mock_session, 500, {"RI": "0"})
 
     with pytest.raises(BeanbagLoginError):
-        await client.login("user@example.com", "0123456789abcdef0123456789abcdef")
+        await http_client.login(_VALID_EMAIL, _VALID_DIGEST)
 
 
-@pytest.mark.asyncio
-async def test_login_rejects_unsuccessful_indicator() -> None:
+async def test_login_rejects_unsuccessful_indicator(
+    mock_session: Mock, http_client: BeanbagHttpClient
+) -> None:
     """Raise when the login response indicates failure."""
 
-    session = Mock()
-    payload = {"RI": "0", "D": {}}
-    session.post = Mock(return_value=DummyResponse(200, payload))
-    client = BeanbagHttpClient(session)
+    _post_response(mock_session, 200, {"RI": "0", "D": {}})
 
     with pytest.raises(BeanbagLoginError):
-        await client.login("user@example.com", "0123456789abcdef0123456789abcdef")
+        await http_client.login(_VALID_EMAIL, _VALID_DIGEST)
 
 
-@pytest.mark.asyncio
-async def test_login_requires_data_object() -> None:
+async def test_login_requires_data_object(
+    mock_session: Mock, http_client: BeanbagHttpClient
+) -> None:
     """Raise when the login payload lacks the data block."""
 
-    session = Mock()
-    payload = {"RI": "1", "D": None}
-    session.post = Mock(return_value=DummyResponse(200, payload))
-    client = BeanbagHttpClient(session)
+    _post_response(mock_session, 200, {"RI": "1", "D": None})
 
     with pytest.raises(BeanbagLoginError):
-        await client.login("user@example.com", "0123456789abcdef0123456789abcdef")
+        await http_client.login(_VALID_EMAIL, _VALID_DIGEST)
 
 
-@pytest.mark.asyncio
-async def test_login_requires_expected_fields() -> None:
+async def test_login_requires_expected_fields(
+    mock_session: Mock, http_client: BeanbagHttpClient
+) -> None:
     """Raise when the login payload omits mandatory fields."""
 
-    session = Mock()
-    payload = {"RI": "1", "D": {"UI": 2}}
-    session.post = Mock(return_value=DummyResponse(200, payload))
-    client = BeanbagHttpClient(session)
+    _post_response(mock_session, 200, {"RI": "1", "D": {"UI": 2}})
 
     with pytest.raises(BeanbagLoginError):
-        await client.login("user@example.com", "0123456789abcdef0123456789abcdef")
+        await http_client.login(_VALID_EMAIL, _VALID_DIGEST)
 
 
-@pytest.mark.asyncio
-async def test_websocket_connect_uses_expected_headers() -> None:
+async def test_websocket_connect_uses_expected_headers(
+    mock_session: Mock, session_data: BeanbagSession
+) -> None:
     """Verify the WebSocket client sets the documented headers."""
 
-    session = Mock()
     fake_ws = object()
-    session.ws_connect = AsyncMock(return_value=fake_ws)
-    client = BeanbagWebSocketClient(session)
-
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
+    mock_session.ws_connect = AsyncMock(return_value=fake_ws)
+    client = BeanbagWebSocketClient(mock_session)
 
     websocket = await client.connect(session_data)
 
     assert websocket is fake_ws
-    session.ws_connect.assert_awaited_once()
-    args, kwargs = session.ws_connect.call_args
+    assert mock_session.ws_connect.await_count == 1
+    args, kwargs = mock_session.ws_connect.call_args
     assert args[0] == "wss://app.beanbag.online/api/TransactionRestAPI/ConnectWebSocket"
-    assert kwargs["headers"] == {
-        "Authorization": "Bearer jwt",
-        "Session-id": "abc",
-        "Request-id": "1",
-    }
+    assert kwargs["headers"] == _EXPECTED_WS_HEADERS
     assert kwargs["protocols"] == ["BB-BO-01"]
 
 
-@pytest.mark.asyncio
-async def test_websocket_connect_translates_errors() -> None:
+async def test_websocket_connect_translates_errors(
+    mock_session: Mock, session_data: BeanbagSession
+) -> None:
     """Translate aiohttp WebSocket failures into BeanbagWebSocketError."""
 
-    session = Mock()
-    session.ws_connect = AsyncMock(side_effect=ClientError("boom"))
-    client = BeanbagWebSocketClient(session)
-
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
+    mock_session.ws_connect = AsyncMock(side_effect=ClientError("boom"))
+    client = BeanbagWebSocketClient(mock_session)
 
     with pytest.raises(BeanbagWebSocketError):
         await client.connect(session_data)
 
 
-@pytest.mark.asyncio
-async def test_backend_login_and_connect_flow() -> None:
+async def test_backend_login_and_connect_flow(mock_session: Mock) -> None:
     """Verify the combined backend performs login then WebSocket connect."""
 
-    session = Mock()
-    payload = {
-        "RI": "1",
-        "D": {"UI": 5, "SI": 6, "JT": "jwt-token"},
-    }
-    session.post = Mock(return_value=DummyResponse(200, payload))
+    _post_response(mock_session, 200, _LOGIN_MINIMAL_PAYLOAD)
     fake_ws = object()
-    session.ws_connect = AsyncMock(return_value=fake_ws)
+    mock_session.ws_connect = AsyncMock(return_value=fake_ws)
 
-    backend = BeanbagBackend(session)
+    backend = BeanbagBackend(mock_session)
     session_data, websocket = await backend.login_and_connect(
-        "user@example.com", "0123456789abcdef0123456789abcdef"
+        _VALID_EMAIL, _VALID_DIGEST
     )
 
     assert session_data.token == "jwt-token"
     assert websocket is fake_ws
-    assert session.post.called
-    assert session.ws_connect.called
-
-
-@pytest.mark.asyncio
-async def test_backend_read_device_metadata(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Ensure metadata requests are sent with the documented headers."""
-
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-    response_payload = {"BOI": "controller"}
-
-    class DummyWebSocket:
-        def __init__(self) -> None:
-            self.sent: list[dict[str, Any]] = []
-
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            self.sent.append(payload)
-
-        async def receive_json(self) -> dict[str, Any]:
-            return {"I": expected_correlation, "R": response_payload}
-
-    websocket = DummyWebSocket()
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
-
-    metadata = await backend.read_device_metadata(session_data, websocket, "gateway-1")
-
-    assert metadata == response_payload
-    assert websocket.sent
-    header = websocket.sent[0]["P"][0]
-    assert header == {"GMI": "gateway-1", "HI": 17, "SI": 11}
-    assert websocket.sent[0]["I"] == expected_correlation
-
-
-@pytest.mark.asyncio
-async def test_backend_read_device_metadata_validates_payload(
-    monkeypatch: pytest.MonkeyPatch,
+    assert mock_session.post.called
+    assert mock_session.ws_connect.called
+
+
+@pytest.mark.parametrize(
+    ("method_name", "header_hi", "header_si", "result", "expected"),
+    [
+        ("read_device_metadata", 17, 11, {"BOI": "controller"}, {"BOI": "controller"}),
+        ("read_zone_topology", 49, 11, [{"ZN": 1}, "ignored"], [{"ZN": 1}]),
+        ("read_schedule_overview", 5, 1, {"V": [1, 2, 3]}, {"V": [1, 2, 3]}),
+        ("read_device_configuration", 14, 11, {"V": []}, {"V": []}),
+    ],
+    ids=["metadata", "zone_topology", "schedule_overview", "configuration"],
+)
+async def test_backend_read_helpers_return_payload(
+    session_data: BeanbagSession,
+    method_name: str,
+    header_hi: int,
+    header_si: int,
+    result: Any,
+    expected: Any,
 ) -> None:
-    """Raise an error when the metadata payload is not an object."""
-
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
+    """Ensure read helpers send the documented headers and return the result."""
 
-    class DummyWebSocket:
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            return None
+    websocket = FakeWebSocket([{"I": _EXPECTED_CORRELATION, "R": result}])
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
-        async def receive_json(self) -> dict[str, Any]:
-            return {"I": expected_correlation, "R": []}
+    method = getattr(backend, method_name)
+    payload = await method(session_data, websocket, "gateway-1")
 
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
-
-    with pytest.raises(BeanbagWebSocketError):
-        await backend.read_device_metadata(session_data, DummyWebSocket(), "gateway-1")
-
-
-@pytest.mark.asyncio
-async def test_backend_read_zone_topology_filters_entries(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """Ensure non-dictionary entries are ignored from the zone list."""
-
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-
-    class DummyWebSocket:
-        def __init__(self) -> None:
-            self.sent: list[dict[str, Any]] = []
-
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            self.sent.append(payload)
-
-        async def receive_json(self) -> dict[str, Any]:
-            return {"I": expected_correlation, "R": [{"ZN": 1}, "ignored"]}
-
-    websocket = DummyWebSocket()
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
-
-    zones = await backend.read_zone_topology(session_data, websocket, "gateway-1")
-
-    assert zones == [{"ZN": 1}]
-    assert websocket.sent
-    assert websocket.sent[0]["P"][0] == {"GMI": "gateway-1", "HI": 49, "SI": 11}
-
-
-@pytest.mark.asyncio
-async def test_backend_read_zone_topology_requires_list(
-    monkeypatch: pytest.MonkeyPatch,
+    assert payload == expected
+    assert websocket.sent[0]["P"][0] == {
+        "GMI": "gateway-1",
+        "HI": header_hi,
+        "SI": header_si,
+    }
+    assert websocket.sent[0]["I"] == _EXPECTED_CORRELATION
+
+
+@pytest.mark.parametrize(
+    ("method_name", "result"),
+    [
+        ("read_device_metadata", []),
+        ("read_zone_topology", {"not": "a list"}),
+        ("read_schedule_overview", [1, 2, 3]),
+        ("read_device_configuration", "not-a-dict"),
+        ("read_live_state", []),
+    ],
+    ids=[
+        "metadata",
+        "zone_topology",
+        "schedule_overview",
+        "configuration",
+        "live_state",
+    ],
+)
+async def test_backend_read_helpers_reject_malformed_payload(
+    session_data: BeanbagSession, method_name: str, result: Any
 ) -> None:
-    """Raise when the zone payload is not a list."""
-
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-
-    class DummyWebSocket:
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            return None
-
-        async def receive_json(self) -> dict[str, Any]:
-            return {"I": expected_correlation, "R": {"not": "a list"}}
+    """Raise when a read helper receives a payload of the wrong shape."""
 
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
+    websocket = FakeWebSocket([{"I": _EXPECTED_CORRELATION, "R": result}])
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     with pytest.raises(BeanbagWebSocketError):
-        await backend.read_zone_topology(session_data, DummyWebSocket(), "gateway-1")
+        await getattr(backend, method_name)(session_data, websocket, "gateway-1")
 
 
-@pytest.mark.asyncio
 async def test_backend_sync_gateway_clock_validates_ack(
-    monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Raise when the controller clock reply is not the expected acknowledgement."""
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-
-    class DummyWebSocket:
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            return None
-
-        async def receive_json(self) -> dict[str, Any]:
-            return {"I": expected_correlation, "R": 5}
-
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1234)
+    websocket = FakeWebSocket([{"I": _EXPECTED_CORRELATION, "R": 5}])
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     with pytest.raises(BeanbagWebSocketError):
-        await backend.sync_gateway_clock(session_data, DummyWebSocket(), "gateway-1")
+        await backend.sync_gateway_clock(session_data, websocket, "gateway-1")
 
 
-@pytest.mark.asyncio
 async def test_backend_sync_gateway_clock_accepts_ack(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Accept acknowledgement payloads that match vendor behaviour."""
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-
-    class DummyWebSocket:
-        def __init__(self) -> None:
-            self.sent: list[dict[str, Any]] = []
-
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            self.sent.append(payload)
-
-        async def receive_json(self) -> dict[str, Any]:
-            return {"I": expected_correlation, "R": 0}
-
-    websocket = DummyWebSocket()
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 2468)
+    websocket = FakeWebSocket([{"I": _EXPECTED_CORRELATION, "R": 0}])
+    backend = BeanbagBackend(_UNUSED_SESSION)
+    monkeypatch.setattr(beanbag.time, "time", lambda: 2468)
 
     await backend.sync_gateway_clock(session_data, websocket, "gateway-1")
 
     assert websocket.sent[0]["P"][1] == [2468]
 
 
-@pytest.mark.asyncio
-async def test_backend_read_schedule_overview_requires_object(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """Raise when the schedule overview payload is not an object."""
-
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-
-    class DummyWebSocket:
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            return None
-
-        async def receive_json(self) -> dict[str, Any]:
-            return {"I": expected_correlation, "R": [1, 2, 3]}
-
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
-
-    with pytest.raises(BeanbagWebSocketError):
-        await backend.read_schedule_overview(session_data, DummyWebSocket(), "gateway-1")
-
-
-@pytest.mark.asyncio
-async def test_backend_read_schedule_overview_returns_payload(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """Return the schedule payload when the structure matches expectations."""
-
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-
-    class DummyWebSocket:
-        def __init__(self) -> None:
-            self.sent: list[dict[str, Any]] = []
-
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            self.sent.append(payload)
-
-        async def receive_json(self) -> dict[str, Any]:
-            return {"I": expected_correlation, "R": {"V": [1, 2, 3]}}
-
-    websocket = DummyWebSocket()
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
-
-    payload = await backend.read_schedule_overview(
-        session_data, websocket, "gateway-1"
-    )
-
-    assert payload == {"V": [1, 2, 3]}
-
-
-@pytest.mark.asyncio
-async def test_backend_read_device_configuration_requires_object(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    """Raise when the configuration payload is not an object."""
-
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-
-    class DummyWebSocket:
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            return None
-
-        async def receive_json(self) -> dict[str, Any]:
-            return {"I": expected_correlation, "R": "not-a-dict"}
-
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
-
-    with pytest.raises(BeanbagWebSocketError):
-        await backend.read_device_configuration(
-            session_data, DummyWebSocket(), "gateway-1"
-        )
-
-
-@pytest.mark.asyncio
-async def test_backend_read_device_configuration_returns_payload(
-    monkeypatch: pytest.MonkeyPatch,
+@pytest.mark.parametrize(
+    ("payload", "expected"),
+    [
+        ({}, None),
+        ({"V": ["not-dict"]}, None),
+        ({"V": [{"SI": 10}]}, None),
+        ({"V": [{"SI": 33, "V": "bad"}]}, None),
+        ({"V": [{"SI": 33, "V": [{}]}]}, None),
+        ({"V": [{"SI": 33, "V": [{"I": 99}]}]}, None),
+        ({"V": [{"SI": 33, "V": [{"I": 6, "V": 2}]}]}, True),
+        ({"V": [{"SI": 33, "V": ["skip", {"I": 6, "V": 0}]}]}, False),
+    ],
+)
+def test_backend_extract_primary_power_variants(
+    payload: dict[str, Any], expected: bool | None
 ) -> None:
-    """Return configuration payloads that match the documented format."""
-
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-
-    class DummyWebSocket:
-        def __init__(self) -> None:
-            self.sent: list[dict[str, Any]] = []
-
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            self.sent.append(payload)
-
-        async def receive_json(self) -> dict[str, Any]:
-            return {"I": expected_correlation, "R": {"V": []}}
-
-    websocket = DummyWebSocket()
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
-
-    payload = await backend.read_device_configuration(
-        session_data, websocket, "gateway-1"
-    )
-
-    assert payload == {"V": []}
-
-
-def test_backend_extract_primary_power_variants() -> None:
     """Cover edge cases for parsing the primary power flag."""
 
-    backend = BeanbagBackend(Mock())
-
-    assert backend._extract_primary_power({}) is None
-    assert backend._extract_primary_power({"V": ["not-dict"]}) is None
-    assert backend._extract_primary_power({"V": [{"SI": 10}]}) is None
-    assert backend._extract_primary_power({"V": [{"SI": 33, "V": "bad"}]}) is None
-    assert (
-        backend._extract_primary_power({"V": [{"SI": 33, "V": [{}]}]}) is None
-    )
-    assert (
-        backend._extract_primary_power({"V": [{"SI": 33, "V": [{"I": 99}]}]})
-        is None
-    )
-    assert (
-        backend._extract_primary_power(
-            {"V": [{"SI": 33, "V": [{"I": 6, "V": 2}]}]}
-        )
-        is True
-    )
-    assert (
-        backend._extract_primary_power(
-            {"V": [{"SI": 33, "V": ["skip", {"I": 6, "V": 0}]}]}
-        )
-        is False
-    )
+    assert BeanbagBackend._extract_primary_power(payload) is expected
 
 
-@pytest.mark.asyncio
 async def test_backend_read_live_state_parses_primary_power(
-    monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Parse the primary power flag from a live state payload."""
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-
-    class DummyWebSocket:
-        def __init__(self) -> None:
-            self.sent: list[dict[str, Any]] = []
-
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            self.sent.append(payload)
-
-        async def receive_json(self) -> dict[str, Any]:
-            payload = {
-                "I": expected_correlation,
-                "R": {
-                    "V": [
-                        {"SI": 33, "V": [{"I": 6, "V": 0}]},
-                        {
-                            "SI": 16,
-                            "V": [
-                                {"I": 4, "V": 1},
-                                {"I": 9, "V": 600},
-                                {"I": 27, "V": 1},
-                            ],
-                        },
-                    ]
-                },
-            }
-            return payload
-
-    websocket = DummyWebSocket()
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
+    websocket = FakeWebSocket([_LIVE_STATE_REPLY])
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     snapshot = await backend.read_live_state(session_data, websocket, "gateway-1")
 
@@ -735,43 +470,12 @@ async def test_backend_read_live_state_parses_primary_power(
     assert websocket.sent[0]["P"][0] == {"GMI": "gateway-1", "HI": 3, "SI": 1}
 
 
-@pytest.mark.asyncio
-async def test_backend_read_live_state_requires_object(
-    monkeypatch: pytest.MonkeyPatch,
+async def test_backend_read_energy_history_parses_samples(
+    session_data: BeanbagSession,
 ) -> None:
-    """Raise when the live state payload is not an object."""
-
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-
-    class DummyWebSocket:
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            return None
-
-        async def receive_json(self) -> dict[str, Any]:
-            return {"I": expected_correlation, "R": []}
-
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
-
-    with pytest.raises(BeanbagWebSocketError):
-        await backend.read_live_state(session_data, DummyWebSocket(), "gateway-1")
-
-
-@pytest.mark.asyncio
-async def test_backend_read_energy_history_parses_samples() -> None:
     """Validate that energy history responses are parsed into samples."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     async def fake_send_request(*args, **kwargs):
         return [
@@ -802,8 +506,7 @@ async def test_backend_read_energy_history_parses_samples() -> None:
 
     backend._send_request = fake_send_request  # type: ignore[assignment]
 
-    session = BeanbagSession(1, "abc", "token", None, ())
-    samples = await backend.read_energy_history(session, Mock(), "gateway-1")
+    samples = await backend.read_energy_history(session_data, Mock(), "gateway-1")
 
     assert samples == [
         BeanbagEnergySample(
@@ -827,11 +530,12 @@ async def test_backend_read_energy_history_parses_samples() -> None:
     ]
 
 
-@pytest.mark.asyncio
-async def test_backend_read_energy_history_handles_invalid_entries() -> None:
+async def test_backend_read_energy_history_handles_invalid_entries(
+    session_data: BeanbagSession,
+) -> None:
     """Ensure malformed entries are ignored without crashing."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     async def fake_send_request(*args, **kwargs):
         return [
@@ -866,8 +570,7 @@ async def test_backend_read_energy_history_handles_invalid_entries() -> None:
 
     backend._send_request = fake_send_request  # type: ignore[assignment]
 
-    session = BeanbagSession(1, "abc", "token", None, ())
-    samples = await backend.read_energy_history(session, Mock(), "gateway-1")
+    samples = await backend.read_energy_history(session_data, Mock(), "gateway-1")
 
     assert samples == [
         BeanbagEnergySample(
@@ -882,20 +585,20 @@ async def test_backend_read_energy_history_handles_invalid_entries() -> None:
     ]
 
 
-@pytest.mark.asyncio
-async def test_backend_read_energy_history_requires_list() -> None:
+async def test_backend_read_energy_history_requires_list(
+    session_data: BeanbagSession,
+) -> None:
     """Raise when the energy history payload is not a list."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     async def fake_send_request(*args, **kwargs):
         return {"unexpected": True}
 
     backend._send_request = fake_send_request  # type: ignore[assignment]
 
-    session = BeanbagSession(1, "abc", "token", None, ())
     with pytest.raises(BeanbagWebSocketError):
-        await backend.read_energy_history(session, Mock(), "gateway-1")
+        await backend.read_energy_history(session_data, Mock(), "gateway-1")
 
 
 def test_coerce_energy_validates_inputs() -> None:
@@ -916,23 +619,16 @@ def test_coerce_minutes_validates_inputs() -> None:
         _coerce_minutes(-5)
 
 
-@pytest.mark.asyncio
 async def test_backend_turn_controller_commands(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Verify power commands invoke the WebSocket helper with correct payloads."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value=0)
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
     websocket = Mock()
 
     await backend.turn_controller_on(session_data, websocket, "gateway-1")
@@ -956,21 +652,16 @@ async def test_backend_turn_controller_commands(
     }
 
 
-@pytest.mark.asyncio
-async def test_backend_set_timed_boost_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_backend_set_timed_boost_enabled(
+    monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
+) -> None:
     """Verify timed boost toggles use the documented payload."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value=0)
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
     websocket = Mock()
 
     await backend.set_timed_boost_enabled(
@@ -992,45 +683,32 @@ async def test_backend_set_timed_boost_enabled(monkeypatch: pytest.MonkeyPatch)
     }
 
 
-@pytest.mark.asyncio
 async def test_backend_set_timed_boost_ack_error(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Raise when the timed boost acknowledgement is unexpected."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value="nope")
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
     with pytest.raises(BeanbagWebSocketError):
         await backend.set_timed_boost_enabled(
             session_data, Mock(), "gateway-1", enabled=True
         )
 
 
-@pytest.mark.asyncio
-async def test_backend_start_timed_boost(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_backend_start_timed_boost(
+    monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
+) -> None:
     """Verify timed boost start commands use the documented payload."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value=0)
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
     websocket = Mock()
 
     await backend.start_timed_boost(
@@ -1044,18 +722,12 @@ async def test_backend_start_timed_boost(monkeypatch: pytest.MonkeyPatch) -> Non
     }
 
 
-@pytest.mark.asyncio
-async def test_backend_start_timed_boost_invalid_duration() -> None:
+async def test_backend_start_timed_boost_invalid_duration(
+    session_data: BeanbagSession,
+) -> None:
     """Reject zero or negative boost durations."""
 
-    backend = BeanbagBackend(Mock())
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     with pytest.raises(ValueError):
         await backend.start_timed_boost(
@@ -1063,46 +735,32 @@ async def test_backend_start_timed_boost_invalid_duration() -> None:
         )
 
 
-@pytest.mark.asyncio
 async def test_backend_start_timed_boost_ack_error(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Raise when the timed boost start acknowledgement is unexpected."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value=5)
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
     with pytest.raises(BeanbagWebSocketError):
         await backend.start_timed_boost(
             session_data, Mock(), "gateway-1", duration_minutes=30
         )
 
 
-@pytest.mark.asyncio
-async def test_backend_stop_timed_boost(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_backend_stop_timed_boost(
+    monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
+) -> None:
     """Verify the cancel command issues the documented payload."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value=0)
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
     await backend.stop_timed_boost(session_data, Mock(), "gateway-1")
 
     assert send.await_args_list[0].kwargs == {
@@ -1112,24 +770,16 @@ async def test_backend_stop_timed_boost(monkeypatch: pytest.MonkeyPatch) -> None
     }
 
 
-@pytest.mark.asyncio
 async def test_backend_stop_timed_boost_ack_error(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Raise when the timed boost stop acknowledgement is unexpected."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value="oops")
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
     with pytest.raises(BeanbagWebSocketError):
         await backend.stop_timed_boost(session_data, Mock(), "gateway-1")
 
@@ -1137,7 +787,7 @@ async def test_backend_stop_timed_boost_ack_error(
 def test_extract_timed_boost_flag_edge_cases() -> None:
     """Exercise edge cases in the timed boost extractor."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     assert backend._extract_timed_boost_flag({}) is None
     assert backend._extract_timed_boost_flag({"V": ["invalid"]}) is None
@@ -1159,7 +809,7 @@ def test_extract_timed_boost_flag_edge_cases() -> None:
 def test_extract_timed_boost_state_helpers() -> None:
     """Exercise the boost state helper extractors."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     payload = {
         "V": [
             {
@@ -1198,41 +848,31 @@ def test_extract_timed_boost_state_helpers() -> None:
     assert backend._extract_timed_boost_end_minute({}) is None
 
 
-@pytest.mark.asyncio
 async def test_backend_turn_controller_mode_write_error(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Raise when the mode write acknowledgement is unexpected."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value=5)
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
     with pytest.raises(BeanbagWebSocketError):
         await backend.turn_controller_on(session_data, Mock(), "gateway-1")
 
 
-@pytest.mark.asyncio
 async def test_backend_read_weekly_program_parses_payload(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Parse the flattened weekly program into structured day slots."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     def build_day(events: list[tuple[int, int]]) -> list[dict[str, int]]:
         day = [{"O": minute, "T": state} for minute, state in events]
-        while len(day) < 6:
-            day.append({"O": 65535, "T": 255})
-        return day
+        return day + [_EMPTY_TRANSITION] * (6 - len(day))
 
     transitions: list[dict[str, int]] = []
     transitions.extend(build_day([(60, 1), (120, 0)]))  # Monday
@@ -1246,14 +886,6 @@ async def test_backend_read_weekly_program_parses_payload(
     send = AsyncMock(return_value=["unexpected", {"I": 1, "D": transitions}])
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
     program = await backend.read_weekly_program(
         session_data,
         Mock(),
@@ -1276,24 +908,16 @@ async def test_backend_read_weekly_program_parses_payload(
     }
 
 
-@pytest.mark.asyncio
 async def test_backend_read_weekly_program_invalid_payload(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Raise when the weekly program payload structure is unexpected."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value=[{"I": 1, "D": "not-a-list"}])
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
     with pytest.raises(BeanbagWebSocketError):
         await backend.read_weekly_program(
             session_data,
@@ -1303,25 +927,17 @@ async def test_backend_read_weekly_program_invalid_payload(
         )
 
 
-@pytest.mark.asyncio
 async def test_backend_read_weekly_program_pads_short_payload(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Pad missing transition slots with sentinel entries."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     transitions = [{"O": 45, "T": 1}, None]
     send = AsyncMock(return_value=[{"I": 1, "D": transitions}])
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
     program = await backend.read_weekly_program(
         session_data,
         Mock(),
@@ -1333,13 +949,13 @@ async def test_backend_read_weekly_program_pads_short_payload(
     assert program[1].on_minutes == (None, None, None)
 
 
-@pytest.mark.asyncio
 async def test_backend_read_weekly_program_truncates_long_payload(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Discard excess transition entries beyond the weekly capacity."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     transitions = [
         {"O": (i * 5) % 1440, "T": 1 if i % 2 == 0 else 0} for i in range(50)
     ]
@@ -1347,14 +963,6 @@ async def test_backend_read_weekly_program_truncates_long_payload(
     send = AsyncMock(return_value=[{"I": 2, "D": transitions}])
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
     program = await backend.read_weekly_program(
         session_data,
         Mock(),
@@ -1370,19 +978,13 @@ async def test_backend_read_weekly_program_truncates_long_payload(
     assert total_slots <= 42
 
 
-@pytest.mark.asyncio
-async def test_backend_read_weekly_program_missing_schedule() -> None:
+async def test_backend_read_weekly_program_missing_schedule(
+    session_data: BeanbagSession,
+) -> None:
     """Raise when the weekly program payload omits the schedule block."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     backend._send_request = AsyncMock(return_value=[])  # type: ignore[attr-defined]
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
 
     with pytest.raises(BeanbagWebSocketError):
         await backend.read_weekly_program(
@@ -1393,18 +995,12 @@ async def test_backend_read_weekly_program_missing_schedule() -> None:
         )
 
 
-@pytest.mark.asyncio
-async def test_backend_read_weekly_program_rejects_zone() -> None:
+async def test_backend_read_weekly_program_rejects_zone(
+    session_data: BeanbagSession,
+) -> None:
     """Reject unsupported zone selectors."""
 
-    backend = BeanbagBackend(Mock())
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     with pytest.raises(ValueError):
         await backend.read_weekly_program(
@@ -1415,32 +1011,23 @@ async def test_backend_read_weekly_program_rejects_zone() -> None:
         )
 
 
-@pytest.mark.asyncio
 async def test_backend_write_weekly_program_transmits_payload(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Ensure the payload flattens each day into 6 transition slots."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value=0)
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
-    empty_day = DailyProgram((None, None, None), (None, None, None))
     program = (
         DailyProgram((60, None, None), (120, None, None)),
-        empty_day,
+        _EMPTY_DAY,
         DailyProgram((300, 540, None), (360, 600, None)),
-        empty_day,
-        empty_day,
-        empty_day,
+        _EMPTY_DAY,
+        _EMPTY_DAY,
+        _EMPTY_DAY,
         DailyProgram((None, None, None), (720, None, None)),
     )
 
@@ -1452,17 +1039,18 @@ async def test_backend_write_weekly_program_transmits_payload(
         zone="primary",
     )
 
-    assert send.await_args.kwargs["header_hi"] == 21
-    assert send.await_args.kwargs["header_si"] == 17
+    kwargs = send.await_args.kwargs
+    assert kwargs["header_hi"] == 21
+    assert kwargs["header_si"] == 17
 
-    payload = send.await_args.kwargs["args"]
+    payload = kwargs["args"]
     assert isinstance(payload, list)
     assert payload and payload[0]["I"] == 1
     transitions = payload[0]["D"]
     assert len(transitions) == 42
     assert transitions[0] == {"O": 60, "T": 1}
     assert transitions[1] == {"O": 120, "T": 0}
-    assert transitions[2] == {"O": 65535, "T": 255}
+    assert transitions[2] == _EMPTY_TRANSITION
     third_day_start = 2 * 6
     assert transitions[third_day_start] == {"O": 300, "T": 1}
     assert transitions[third_day_start + 1] == {"O": 360, "T": 0}
@@ -1470,85 +1058,42 @@ async def test_backend_write_weekly_program_transmits_payload(
     assert transitions[third_day_start + 3] == {"O": 600, "T": 0}
     sunday_start = 6 * 6
     assert transitions[sunday_start] == {"O": 720, "T": 0}
-    for offset in range(1, 6):
-        assert transitions[sunday_start + offset] == {"O": 65535, "T": 255}
+    assert transitions[sunday_start + 1 : sunday_start + 6] == [_EMPTY_TRANSITION] * 5
 
 
-@pytest.mark.asyncio
 async def test_backend_write_weekly_program_ack_error(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Raise when the program write acknowledgement is unexpected."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value=5)
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
-    empty_day = DailyProgram((None, None, None), (None, None, None))
-    program = (
-        empty_day,
-        empty_day,
-        empty_day,
-        empty_day,
-        empty_day,
-        empty_day,
-        empty_day,
-    )
-
     with pytest.raises(BeanbagWebSocketError):
         await backend.write_weekly_program(
             session_data,
             Mock(),
             "gateway-1",
-            program,
+            _EMPTY_WEEK,
             zone="primary",
         )
 
-@pytest.mark.asyncio
 async def test_backend_send_request_handles_informational_frames(
-    monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Ensure the request helper skips non-result frames and errors when needed."""
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-
-    class DummyWebSocket:
-        def __init__(self) -> None:
-            self.sent: list[dict[str, Any]] = []
-            self._responses = [
-                ["not-a-dict"],
-                {"I": "other", "R": 0},
-                {"I": expected_correlation, "M": "Notify"},
-                {"I": expected_correlation},
-            ]
-
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            self.sent.append(payload)
-
-        async def receive_json(self) -> Any:
-            return self._responses.pop(0)
-
-    websocket = DummyWebSocket()
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
+    websocket = FakeWebSocket(
+        [
+            ["not-a-dict"],
+            {"I": "other", "R": 0},
+            {"I": _EXPECTED_CORRELATION, "M": "Notify"},
+            {"I": _EXPECTED_CORRELATION},
+        ]
     )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     with pytest.raises(BeanbagWebSocketError):
         await backend._send_request(  # type: ignore[attr-defined]
@@ -1559,23 +1104,14 @@ async def test_backend_send_request_handles_informational_frames(
             header_si=2,
         )
 
-    assert websocket.sent
+    assert len(websocket.sent) == 1
 
 
-@pytest.mark.asyncio
 async def test_backend_send_request_closes_on_send_error(
-    monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Convert transport errors during send into Beanbag exceptions."""
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
     class ClosingWebSocket:
         def __init__(self) -> None:
             self.closed = False
@@ -1589,11 +1125,7 @@ async def test_backend_send_request_closes_on_send_error(
             self.close_calls += 1
 
     websocket = ClosingWebSocket()
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     with pytest.raises(BeanbagWebSocketError):
         await backend._send_request(  # type: ignore[attr-defined]
@@ -1608,35 +1140,11 @@ async def test_backend_send_request_closes_on_send_error(
     assert websocket.close_calls == 1
 
 
-@pytest.mark.asyncio
-async def test_backend_send_request_with_args(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_backend_send_request_with_args(session_data: BeanbagSession) -> None:
     """Ensure argument lists are included in the transmitted payload."""
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-    expected_correlation = "abc-00000001"
-
-    class DummyWebSocket:
-        def __init__(self) -> None:
-            self.sent: list[dict[str, Any]] = []
-
-        async def send_json(self, payload: dict[str, Any]) -> None:
-            self.sent.append(payload)
-
-        async def receive_json(self) -> dict[str, Any]:
-            return {"I": expected_correlation, "R": 0}
-
-    websocket = DummyWebSocket()
-    backend = BeanbagBackend(Mock())
-    monkeypatch.setattr(
-        "custom_components.securemtr.beanbag.secrets.randbits", lambda bits: 1
-    )
-    monkeypatch.setattr("custom_components.securemtr.beanbag.time.time", lambda: 1000)
+    websocket = FakeWebSocket([{"I": _EXPECTED_CORRELATION, "R": 0}])
+    backend = BeanbagBackend(_UNUSED_SESSION)
 
     result = await backend._send_request(  # type: ignore[attr-defined]
         session_data,
@@ -1650,140 +1158,82 @@ async def test_backend_send_request_with_args(monkeypatch: pytest.MonkeyPatch) -
     assert result == 0
     assert websocket.sent[0]["P"][1] == [1, {"I": 6, "V": 2}]
 
-def test_backend_parse_daily_program_invalid_structure() -> None:
-    """Raise when daily entries lack integer minute fields."""
-
-    with pytest.raises(BeanbagWebSocketError):
-        BeanbagBackend._parse_daily_program([{ "O": "bad", "T": 1 }])
-
-
-def test_backend_parse_daily_program_minute_bounds() -> None:
-    """Raise when daily entries specify out-of-range minutes."""
-
-    with pytest.raises(BeanbagWebSocketError):
-        BeanbagBackend._parse_daily_program([{ "O": 2000, "T": 1 }])
-
-
-def test_backend_parse_daily_program_excess_on_transitions() -> None:
-    """Raise when more than three on transitions are reported."""
-
-    entries = [{"O": minute, "T": 1} for minute in (30, 60, 90, 120)]
-    with pytest.raises(BeanbagWebSocketError):
-        BeanbagBackend._parse_daily_program(entries)
-
-
-def test_backend_parse_daily_program_excess_off_transitions() -> None:
-    """Raise when more than three off transitions are reported."""
+@pytest.mark.parametrize(
+    "entries",
+    [
+        [{"O": "bad", "T": 1}],
+        [{"O": 2000, "T": 1}],
+        [{"O": minute, "T": 1} for minute in (30, 60, 90, 120)],
+        [{"O": minute, "T": 0} for minute in (30, 60, 90, 120)],
+        [{"O": 45, "T": 3}],
+    ],
+    ids=[
+        "invalid_structure",
+        "minute_bounds",
+        "excess_on_transitions",
+        "excess_off_transitions",
+        "unknown_state",
+    ],
+)
+def test_backend_parse_daily_program_rejects(entries: list[dict[str, Any]]) -> None:
+    """Raise on malformed, out-of-range, excess or unknown transitions."""
 
-    entries = [{"O": minute, "T": 0} for minute in (30, 60, 90, 120)]
     with pytest.raises(BeanbagWebSocketError):
         BeanbagBackend._parse_daily_program(entries)
 
 
-def test_backend_parse_daily_program_unknown_state() -> None:
-    """Raise when an unsupported transition type is observed."""
-
-    with pytest.raises(BeanbagWebSocketError):
-        BeanbagBackend._parse_daily_program([{ "O": 45, "T": 3 }])
-
-
 def test_backend_parse_daily_program_ignores_noise() -> None:
     """Skip over non-dictionary entries while parsing."""
 
     result = BeanbagBackend._parse_daily_program(["noise", {"O": 45, "T": 1}])
     assert result.on_minutes[0] == 45
 
-def test_backend_build_weekly_program_payload_requires_seven_days() -> None:
-    """Ensure weekly program encoding enforces the seven-day structure."""
-
-    empty_day = DailyProgram((None, None, None), (None, None, None))
-    with pytest.raises(ValueError):
-        BeanbagBackend._build_weekly_program_payload((empty_day,) * 6, 1)
-
-
-def test_backend_build_weekly_program_payload_validates_counts() -> None:
-    """Reject daily schedules that exceed documented transition limits."""
-
-    class FakeDay:
-        def __init__(self, on_minutes: tuple[int | None, ...], off_minutes: tuple[int | None, ...]) -> None:
-            self.on_minutes = on_minutes
-            self.off_minutes = off_minutes
-
-    valid = DailyProgram((None, None, None), (None, None, None))
-    program = (
-        FakeDay((0, 60, 120, 180), (None, None, None)),
-        valid,
-        valid,
-        valid,
-        valid,
-        valid,
-        valid,
-    )
+@pytest.mark.parametrize(
+    "program",
+    [
+        _EMPTY_WEEK[:6],
+        (FakeDay((0, 60, 120, 180), (None, None, None)),) + _EMPTY_WEEK[:6],
+        (FakeDay((1500, None, None), (None, None, None)),) + _EMPTY_WEEK[:6],
+    ],
+    ids=["six_days", "excess_transitions", "minute_out_of_range"],
+)
+def test_backend_build_weekly_program_payload_rejects(program: tuple[Any, ...]) -> None:
+    """Reject programs without seven days or with out-of-limit daily schedules."""
 
     with pytest.raises(ValueError):
         BeanbagBackend._build_weekly_program_payload(program, 1)
 
-    program_bad_minute = (
-        FakeDay((1500, None, None), (None, None, None)),
-        valid,
-        valid,
-        valid,
-        valid,
-        valid,
-        valid,
-    )
-
-    with pytest.raises(ValueError):
-        BeanbagBackend._build_weekly_program_payload(program_bad_minute, 1)
-
-@pytest.mark.asyncio
 async def test_backend_write_weekly_program_boost_zone(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Verify the boost zone maps to index 2 during writes."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value=0)
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
-    empty_day = DailyProgram((None, None, None), (None, None, None))
     await backend.write_weekly_program(
         session_data,
         Mock(),
         "gateway-1",
-        (empty_day,) * 7,
+        _EMPTY_WEEK,
         zone="boost",
     )
 
     args = send.await_args.kwargs["args"]
     assert args[0]["I"] == 2
 
-@pytest.mark.asyncio
 async def test_backend_read_weekly_program_payload_not_list(
     monkeypatch: pytest.MonkeyPatch,
+    session_data: BeanbagSession,
 ) -> None:
     """Raise when the WebSocket payload is not a list."""
 
-    backend = BeanbagBackend(Mock())
+    backend = BeanbagBackend(_UNUSED_SESSION)
     send = AsyncMock(return_value={"invalid": True})
     monkeypatch.setattr(backend, "_send_request", send)
 
-    session_data = BeanbagSession(
-        user_id=1,
-        session_id="abc",
-        token="jwt",
-        token_timestamp=None,
-        gateways=(),
-    )
-
     with pytest.raises(BeanbagWebSocketError):
         await backend.read_weekly_program(
             session_data,
@@ -1,25 +1,22 @@
+from __future__ import annotations
+
 import asyncio
-from dataclasses import dataclass
+from collections.abc import Callable, Iterable
 from types import SimpleNamespace
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import pytest
 
-from custom_components.securemtr import DOMAIN, SecuremtrController, SecuremtrRuntimeData
+from custom_components.securemtr import SecuremtrRuntimeData
+from custom_components.securemtr import binary_sensor as binary_sensor_platform
 from custom_components.securemtr.binary_sensor import (
     SecuremtrBoostActiveBinarySensor,
     async_setup_entry,
 )
-from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.exceptions import HomeAssistantError
 
-
-@dataclass(slots=True)
-class DummyEntry:
-    """Provide the minimal config entry attributes."""
-
-    entry_id: str
-
+if TYPE_CHECKING:
+    from homeassistant.components.binary_sensor import BinarySensorEntity
 
 class DummyBackend:
     """Provide backend stubs to satisfy the runtime interface."""
@@ -28,35 +25,36 @@ class DummyBackend:
         """Unused helper for interface completeness."""
 
 
-def _create_runtime() -> SecuremtrRuntimeData:
+@pytest.fixture
+def runtime(make_runtime: Callable[..., SecuremtrRuntimeData]) -> SecuremtrRuntimeData:
     """Return runtime data with a connected controller."""
 
-    runtime = SecuremtrRuntimeData(backend=DummyBackend())
-    runtime.session = SimpleNamespace()
-    runtime.websocket = SimpleNamespace()
-    runtime.controller = SecuremtrController(
-        identifier="controller-1",
-        name="E7+ Smart Water Heater Controller",
-        gateway_id="gateway-1",
-        serial_number="serial-1",
-        firmware_version="1.0.0",
-        model="E7+",
+    return make_runtime(DummyBackend(), timed_boost_active=False)
+
+
+@pytest.fixture(autouse=True)
+def dispatcher_connections(
+    patch_dispatcher: Callable[[Any, type], list[tuple[object, str, Any]]],
+) -> list[tuple[object, str, Any]]:
+    """Record dispatcher registrations and skip the base entity hook."""
+
+    return patch_dispatcher(
+        binary_sensor_platform, binary_sensor_platform.BinarySensorEntity
     )
-    runtime.timed_boost_active = False
-    runtime.controller_ready.set()
-    return runtime
 
 
-@pytest.mark.asyncio
-async def test_binary_sensor_setup_and_state() -> None:
+async def test_binary_sensor_setup_and_state(
+    runtime: SecuremtrRuntimeData,
+    dispatcher_connections: list[tuple[object, str, Any]],
+    runtime_hass: SimpleNamespace,
+    entry: SimpleNamespace,
+    fake_hass: SimpleNamespace,
+) -> None:
     """Ensure the binary sensor exposes the boost active flag."""
 
-    runtime = _create_runtime()
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
     entities: list[BinarySensorEntity] = []
 
-    await async_setup_entry(hass, entry, entities.extend)
+    await async_setup_entry(runtime_hass, entry, entities.extend)
 
     assert len(entities) == 1
     sensor = entities[0]
@@ -73,16 +71,7 @@ async def test_binary_sensor_setup_and_state() -> None:
     runtime.websocket = None
     assert sensor.available is False
 
-    sensor.hass = SimpleNamespace()
-
-    async def _fake_added(self: SecuremtrBoostActiveBinarySensor) -> None:
-        return None
-
-    connections: list[tuple[object, str, Any]] = []
-
-    def _connect(hass_obj: object, signal: str, callback: Any) -> Any:
-        connections.append((hass_obj, signal, callback))
-        return lambda: None
+    sensor.hass = fake_hass
 
     removals: list[Any] = []
 
@@ -91,56 +80,50 @@ async def test_binary_sensor_setup_and_state() -> None:
 
     sensor.async_on_remove = _record_remove  # type: ignore[assignment]
 
-    with pytest.MonkeyPatch.context() as mp:
-        mp.setattr(
-            "custom_components.securemtr.binary_sensor.BinarySensorEntity.async_added_to_hass",
-            _fake_added,
-        )
-        mp.setattr(
-            "custom_components.securemtr.binary_sensor.async_dispatcher_connect",
-            _connect,
-        )
-        await sensor.async_added_to_hass()
-
-    assert connections[0][0] is sensor.hass
+    await sensor.async_added_to_hass()
+
+    assert dispatcher_connections[0][0] is sensor.hass
     assert removals
 
 
-@pytest.mark.asyncio
-async def test_binary_sensor_requires_controller() -> None:
+async def test_binary_sensor_requires_controller(
+    runtime: SecuremtrRuntimeData,
+    runtime_hass: SimpleNamespace,
+    entry: SimpleNamespace,
+    discard_entities: Callable[[Iterable[Any]], None],
+) -> None:
     """Ensure setup raises when controller metadata is missing."""
 
-    runtime = _create_runtime()
     runtime.controller = None
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
 
     with pytest.raises(HomeAssistantError):
-        await async_setup_entry(hass, entry, lambda entities: None)
+        await async_setup_entry(runtime_hass, entry, discard_entities)
 
 
-@pytest.mark.asyncio
-async def test_binary_sensor_setup_times_out(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_binary_sensor_setup_times_out(
+    monkeypatch: pytest.MonkeyPatch,
+    runtime: SecuremtrRuntimeData,
+    runtime_hass: SimpleNamespace,
+    entry: SimpleNamespace,
+    discard_entities: Callable[[Iterable[Any]], None],
+) -> None:
     """Ensure setup raises when controller metadata is delayed."""
 
-    runtime = _create_runtime()
     runtime.controller_ready = asyncio.Event()
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
 
-    monkeypatch.setattr(
-        "custom_components.securemtr.binary_sensor._CONTROLLER_WAIT_TIMEOUT", 0.01
-    )
+    monkeypatch.setattr(binary_sensor_platform, "_CONTROLLER_WAIT_TIMEOUT", 0.01)
 
     with pytest.raises(HomeAssistantError):
-        await async_setup_entry(hass, entry, lambda entities: None)
+        await async_setup_entry(runtime_hass, entry, discard_entities)
 
 
-@pytest.mark.asyncio
-async def test_binary_sensor_async_added_to_hass_without_hass() -> None:
+async def test_binary_sensor_async_added_to_hass_without_hass(
+    runtime: SecuremtrRuntimeData,
+    dispatcher_connections: list[tuple[object, str, Any]],
+) -> None:
     """Ensure the dispatcher registration exits when hass is missing."""
 
-    runtime = _create_runtime()
     sensor = SecuremtrBoostActiveBinarySensor(runtime, runtime.controller, "entry")
     sensor.hass = None
     await sensor.async_added_to_hass()
+    assert dispatcher_connections == []
@@ -3,21 +3,20 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+from collections.abc import Iterable
 from datetime import datetime, timezone
 import logging
 from types import SimpleNamespace
-from typing import Any, Awaitable, Callable
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 import pytest
 
 from custom_components.securemtr import (
-    DOMAIN,
-    SecuremtrController,
     SecuremtrRuntimeData,
     coerce_end_time,
 )
 from custom_components.securemtr.beanbag import BeanbagError, DailyProgram
+from custom_components.securemtr import button as button_platform
 from custom_components.securemtr.button import (
     SecuremtrCancelBoostButton,
     SecuremtrConsumptionMetricsButton,
@@ -25,15 +24,25 @@ from custom_components.securemtr.button import (
     SecuremtrTimedBoostButton,
     async_setup_entry,
 )
-from homeassistant.components.button import ButtonEntity
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
 
+if TYPE_CHECKING:
+    from homeassistant.components.button import ButtonEntity
 
-@dataclass(slots=True)
-class DummyEntry:
-    """Provide the minimal config entry attributes for setup."""
+# A 30 minute boost pressed at _FIXED_NOW ends at 10:45 the same day.
+_FIXED_NOW = datetime(2024, 1, 1, 10, 15, tzinfo=timezone.utc)
+_FIXED_BOOST_END = datetime(2024, 1, 1, 10, 45, tzinfo=timezone.utc)
 
-    entry_id: str
+# Seeds an active boost for the cancel test; its date is never asserted on.
+_END_TIME_615 = coerce_end_time(615)
+
+# The schedule button only reads these programs, so tests can share them.
+_WEEKDAY = DailyProgram((60, None, None), (120, None, None))
+_WEEKEND = DailyProgram((480, 1020, None), (540, 1320, None))
+_PRIMARY_WEEK = (_WEEKDAY,) * 5 + (_WEEKEND,) * 2
+_BOOST_WEEK = (_WEEKEND,) * 7
+_EMPTY_WEEK = (DailyProgram((None, None, None), (None, None, None)),) * 7
 
 
 class DummyBackend:
@@ -85,34 +94,68 @@ class DummyBackend:
         return program
 
 
-def _create_runtime() -> tuple[SecuremtrRuntimeData, DummyBackend]:
-    """Construct a runtime data object with a ready controller."""
-
-    backend = DummyBackend()
-    runtime = SecuremtrRuntimeData(backend=backend)
-    runtime.session = SimpleNamespace()
-    runtime.websocket = SimpleNamespace()
-    runtime.controller = SecuremtrController(
-        identifier="controller-1",
-        name="E7+ Smart Water Heater Controller",
-        gateway_id="gateway-1",
-        serial_number="serial-1",
-        firmware_version="1.0.0",
-        model="E7+",
-    )
-    runtime.timed_boost_enabled = True
-    runtime.controller_ready.set()
-    return runtime, backend
+@pytest.fixture
+def backend() -> DummyBackend:
+    """Return a fresh backend stub for each test."""
+
+    return DummyBackend()
+
+
+@pytest.fixture
+def runtime(
+    make_runtime: Callable[..., SecuremtrRuntimeData], backend: DummyBackend
+) -> SecuremtrRuntimeData:
+    """Return runtime data wired to the backend stub with timed boost enabled."""
+
+    return make_runtime(backend, timed_boost_enabled=True)
+
+
+def _make_boost_button(
+    runtime: SecuremtrRuntimeData, entry: SimpleNamespace, duration: int = 30
+) -> SecuremtrTimedBoostButton:
+    """Construct a timed boost button without running platform setup."""
+
+    return SecuremtrTimedBoostButton(runtime, runtime.controller, entry, duration)
+
+
+def _make_cancel_button(
+    runtime: SecuremtrRuntimeData,
+    entry: SimpleNamespace,
+) -> SecuremtrCancelBoostButton:
+    """Construct a cancel boost button without running platform setup."""
+
+    return SecuremtrCancelBoostButton(runtime, runtime.controller, entry)
+
+
+def _make_schedule_button(
+    runtime: SecuremtrRuntimeData,
+    entry: SimpleNamespace,
+) -> SecuremtrLogWeeklyScheduleButton:
+    """Construct a weekly schedule button without running platform setup."""
+
+    return SecuremtrLogWeeklyScheduleButton(runtime, runtime.controller, entry)
+
+
+@pytest.fixture
+async def buttons(
+    runtime_hass: SimpleNamespace,
+    entry: SimpleNamespace,
+) -> dict[str, ButtonEntity]:
+    """Run platform setup and return the buttons keyed by unique_id suffix."""
+
+    entities: list[ButtonEntity] = []
+    await async_setup_entry(runtime_hass, entry, entities.extend)
+    return {entity.unique_id.removeprefix("serial_1_"): entity for entity in entities}
 
 
 @pytest.fixture(autouse=True)
 def patch_reconnect(
     monkeypatch: pytest.MonkeyPatch,
-) -> Callable[[DummyEntry, SecuremtrRuntimeData, Callable[[Any, Any, Any], Awaitable[Any]]], Awaitable[Any]]:
+) -> Callable[[SimpleNamespace, SecuremtrRuntimeData, Callable[[Any, Any, Any], Awaitable[Any]]], Awaitable[Any]]:
     """Stub the reconnect helper to operate on the dummy runtime."""
 
     async def _fake_run_with_reconnect(
-        entry: DummyEntry,
+        entry: SimpleNamespace,
         runtime: SecuremtrRuntimeData,
         operation: Callable[[Any, Any, Any], Awaitable[Any]],
     ) -> Any:
@@ -121,27 +164,24 @@ def patch_reconnect(
         return await operation(runtime.backend, runtime.session, runtime.websocket)
 
     monkeypatch.setattr(
-        "custom_components.securemtr.button.async_run_with_reconnect",
-        _fake_run_with_reconnect,
+        button_platform, "async_run_with_reconnect", _fake_run_with_reconnect
     )
     return _fake_run_with_reconnect
 
 
-@pytest.mark.asyncio
-async def test_button_setup_creates_entities() -> None:
-    """Ensure the button platform exposes the configured commands."""
+@pytest.fixture(autouse=True)
+def dispatcher_connections(
+    patch_dispatcher: Callable[[Any, type], list[tuple[object, str, Any]]],
+) -> list[tuple[object, str, Any]]:
+    """Record dispatcher registrations and skip the base entity hook."""
 
-    runtime, _backend = _create_runtime()
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
+    return patch_dispatcher(button_platform, button_platform.ButtonEntity)
 
-    def _add_entities(new: list[ButtonEntity]) -> None:
-        entities.extend(new)
 
-    await async_setup_entry(hass, entry, _add_entities)
+async def test_button_setup_creates_entities(buttons: dict[str, ButtonEntity]) -> None:
+    """Ensure the button platform exposes the configured commands."""
 
-    assert {entity.unique_id for entity in entities} == {
+    assert {entity.unique_id for entity in buttons.values()} == {
         "serial_1_boost_30",
         "serial_1_boost_60",
         "serial_1_boost_120",
@@ -150,55 +190,38 @@ async def test_button_setup_creates_entities() -> None:
         "serial_1_log_schedule",
     }
 
-    cancel_button = next(
-        entity for entity in entities if entity.unique_id.endswith("boost_cancel")
-    )
+    cancel_button = buttons["boost_cancel"]
     assert isinstance(cancel_button, SecuremtrCancelBoostButton)
     assert cancel_button.available is False
 
-    metrics_button = next(
-        entity for entity in entities if entity.unique_id.endswith("refresh_consumption")
-    )
-    assert isinstance(metrics_button, SecuremtrConsumptionMetricsButton)
-
-    schedule_button = next(
-        entity for entity in entities if entity.unique_id.endswith("log_schedule")
-    )
-    assert isinstance(schedule_button, SecuremtrLogWeeklyScheduleButton)
-
-    boost_button = next(
-        entity for entity in entities if entity.unique_id.endswith("boost_60")
-    )
+    assert isinstance(buttons["boost_30"], SecuremtrTimedBoostButton)
+    assert isinstance(buttons["refresh_consumption"], SecuremtrConsumptionMetricsButton)
+    assert isinstance(buttons["log_schedule"], SecuremtrLogWeeklyScheduleButton)
     assert (
-        boost_button.device_info["name"]
+        buttons["boost_60"].device_info["name"]
         == "E7+ Smart Water Heater Controller"
     )
 
 
-@pytest.mark.asyncio
-async def test_boost_button_triggers_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_boost_button_triggers_backend(
+    monkeypatch: pytest.MonkeyPatch,
+    runtime: SecuremtrRuntimeData,
+    backend: DummyBackend,
+    entry: SimpleNamespace,
+    fake_hass: SimpleNamespace,
+) -> None:
     """Verify pressing a boost button calls the backend with the correct duration."""
 
-    runtime, backend = _create_runtime()
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
-
-    await async_setup_entry(hass, entry, entities.extend)
+    boost_button = _make_boost_button(runtime, entry)
 
-    boost_button = next(
-        entity for entity in entities if entity.unique_id.endswith("boost_30")
-    )
-    assert isinstance(boost_button, SecuremtrTimedBoostButton)
-
-    fixed_now = datetime(2024, 1, 1, 10, 15, tzinfo=timezone.utc)
-    monkeypatch.setattr("homeassistant.util.dt.now", lambda: fixed_now)
+    monkeypatch.setattr(dt_util, "now", lambda: _FIXED_NOW)
     monkeypatch.setattr(
-        "custom_components.securemtr.button.async_dispatch_runtime_update",
+        button_platform,
+        "async_dispatch_runtime_update",
         lambda hass_obj, entry_id: None,
     )
 
-    boost_button.hass = SimpleNamespace()
+    boost_button.hass = fake_hass
     await boost_button.async_press()
 
     assert backend.start_calls == [
@@ -206,143 +229,124 @@ async def test_boost_button_triggers_backend(monkeypatch: pytest.MonkeyPatch) ->
     ]
     assert runtime.timed_boost_active is True
     assert runtime.timed_boost_end_minute == (10 * 60 + 45)
-    assert runtime.timed_boost_end_time == coerce_end_time(10 * 60 + 45)
-
-    boost_button.hass = None
-    await boost_button.async_press()
-    assert backend.start_calls[-1] == (
-        runtime.session,
-        runtime.websocket,
-        "gateway-1",
-        30,
-    )
-
-
-@pytest.mark.asyncio
-async def test_boost_button_requires_connection() -> None:
-    """Ensure a missing runtime connection raises an error."""
-
-    runtime, backend = _create_runtime()
-    runtime.session = None
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
+    assert runtime.timed_boost_end_time == _FIXED_BOOST_END
 
-    await async_setup_entry(hass, entry, entities.extend)
 
-    boost_button = next(
-        entity for entity in entities if entity.unique_id.endswith("boost_30")
-    )
+async def test_boost_button_press_without_hass(
+    runtime: SecuremtrRuntimeData,
+    backend: DummyBackend,
+    entry: SimpleNamespace,
+) -> None:
+    """Ensure a boost press still reaches the backend before hass is attached."""
 
-    with pytest.raises(HomeAssistantError):
-        await boost_button.async_press()
-
-    assert backend.start_calls == []
+    boost_button = _make_boost_button(runtime, entry)
+    boost_button.hass = None
+    await boost_button.async_press()
 
+    assert backend.start_calls == [
+        (runtime.session, runtime.websocket, "gateway-1", 30)
+    ]
 
-@pytest.mark.asyncio
-async def test_boost_button_requires_controller() -> None:
-    """Ensure the timed boost button validates controller availability."""
 
-    runtime, backend = _create_runtime()
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
+@pytest.mark.parametrize("failure", ["disconnected", "no_controller", "backend_error"])
+async def test_boost_button_press_failures(
+    monkeypatch: pytest.MonkeyPatch,
+    runtime: SecuremtrRuntimeData,
+    backend: DummyBackend,
+    failure: str,
+    entry: SimpleNamespace,
+) -> None:
+    """Convert missing context and backend failures into Home Assistant errors."""
 
-    await async_setup_entry(hass, entry, entities.extend)
+    boost_button = _make_boost_button(runtime, entry)
 
-    boost_button = next(
-        entity for entity in entities if entity.unique_id.endswith("boost_30")
-    )
+    async def _raise(*args: Any, **kwargs: Any) -> None:
+        raise BeanbagError("boom")
 
-    runtime.controller = None
+    if failure == "disconnected":
+        runtime.session = None
+    elif failure == "no_controller":
+        runtime.controller = None
+    else:
+        monkeypatch.setattr(backend, "start_timed_boost", _raise)
 
     with pytest.raises(HomeAssistantError):
         await boost_button.async_press()
 
     assert backend.start_calls == []
+    assert runtime.timed_boost_active is not True
 
 
-@pytest.mark.asyncio
-async def test_schedule_button_logs_program(caplog: pytest.LogCaptureFixture) -> None:
+async def test_schedule_button_logs_program(
+    caplog: pytest.LogCaptureFixture,
+    runtime: SecuremtrRuntimeData,
+    backend: DummyBackend,
+    entry: SimpleNamespace,
+    fake_hass: SimpleNamespace,
+) -> None:
     """Log both weekly programs when the schedule button is pressed."""
 
-    runtime, backend = _create_runtime()
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
-
-    weekday = DailyProgram((60, None, None), (120, None, None))
-    weekend = DailyProgram((480, 1020, None), (540, 1320, None))
-    backend.weekly_programs = {
-        "primary": (weekday,) * 5 + (weekend,) * 2,
-        "boost": (weekend,) * 7,
-    }
-
-    await async_setup_entry(hass, entry, entities.extend)
+    backend.weekly_programs = {"primary": _PRIMARY_WEEK, "boost": _BOOST_WEEK}
 
-    schedule_button = next(
-        entity for entity in entities if entity.unique_id.endswith("log_schedule")
-    )
-    assert isinstance(schedule_button, SecuremtrLogWeeklyScheduleButton)
+    schedule_button = _make_schedule_button(runtime, entry)
 
-    schedule_button.hass = SimpleNamespace()
+    schedule_button.hass = fake_hass
     with caplog.at_level(logging.INFO):
         await schedule_button.async_press()
 
     assert backend.read_calls == ["primary", "boost"]
-    assert any("primary zone" in record for record in caplog.messages)
-    assert any("boost zone" in record for record in caplog.messages)
-    assert any("Monday" in record and "01:00" in record for record in caplog.messages)
-    assert any("Saturday" in record and "08:00" in record for record in caplog.messages)
-
-
-@pytest.mark.asyncio
-async def test_schedule_button_backend_error(caplog: pytest.LogCaptureFixture) -> None:
+    messages = [
+        record.getMessage()
+        for record in caplog.records
+        if record.name == "custom_components.securemtr.button"
+    ]
+    primary_log = next(message for message in messages if "primary zone" in message)
+    boost_log = next(message for message in messages if "boost zone" in message)
+    assert "Monday" in primary_log and "01:00" in primary_log
+    assert "Saturday" in boost_log and "08:00" in boost_log
+
+
+async def test_schedule_button_backend_error(
+    caplog: pytest.LogCaptureFixture,
+    runtime: SecuremtrRuntimeData,
+    backend: DummyBackend,
+    entry: SimpleNamespace,
+    fake_hass: SimpleNamespace,
+) -> None:
     """Convert backend read failures into Home Assistant errors."""
 
-    runtime, backend = _create_runtime()
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
-
     backend.weekly_programs = {}
     backend.read_error = BeanbagError("boom")
 
-    await async_setup_entry(hass, entry, entities.extend)
-    schedule_button = next(
-        entity for entity in entities if entity.unique_id.endswith("log_schedule")
-    )
+    schedule_button = _make_schedule_button(runtime, entry)
 
-    schedule_button.hass = SimpleNamespace()
+    schedule_button.hass = fake_hass
     with caplog.at_level(logging.ERROR):
         with pytest.raises(HomeAssistantError):
             await schedule_button.async_press()
 
     assert backend.read_calls == ["primary"]
-    assert any("Failed to read Secure Meters weekly schedule" in record for record in caplog.messages)
+    error_log = next(
+        record
+        for record in caplog.records
+        if record.name == "custom_components.securemtr.button"
+        and record.levelno == logging.ERROR
+    )
+    assert "Failed to read Secure Meters weekly schedule" in error_log.getMessage()
 
 
-@pytest.mark.asyncio
-async def test_schedule_button_requires_connection() -> None:
+async def test_schedule_button_requires_connection(
+    runtime: SecuremtrRuntimeData,
+    backend: DummyBackend,
+    entry: SimpleNamespace,
+) -> None:
     """Ensure the schedule button validates the runtime connection."""
 
-    runtime, backend = _create_runtime()
     runtime.session = None
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
-
-    backend.weekly_programs = {
-        "primary": (DailyProgram((None, None, None), (None, None, None)),) * 7,
-        "boost": (DailyProgram((None, None, None), (None, None, None)),) * 7,
-    }
 
-    await async_setup_entry(hass, entry, entities.extend)
+    backend.weekly_programs = {"primary": _EMPTY_WEEK, "boost": _EMPTY_WEEK}
 
-    schedule_button = next(
-        entity for entity in entities if entity.unique_id.endswith("log_schedule")
-    )
+    schedule_button = _make_schedule_button(runtime, entry)
 
     with pytest.raises(HomeAssistantError):
         await schedule_button.async_press()
@@ -350,25 +354,16 @@ async def test_schedule_button_requires_connection() -> None:
     assert backend.read_calls == []
 
 
-@pytest.mark.asyncio
-async def test_schedule_button_requires_controller() -> None:
+async def test_schedule_button_requires_controller(
+    runtime: SecuremtrRuntimeData,
+    backend: DummyBackend,
+    entry: SimpleNamespace,
+) -> None:
     """Ensure the schedule button verifies controller availability."""
 
-    runtime, backend = _create_runtime()
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
-
-    backend.weekly_programs = {
-        "primary": (DailyProgram((None, None, None), (None, None, None)),) * 7,
-        "boost": (DailyProgram((None, None, None), (None, None, None)),) * 7,
-    }
-
-    await async_setup_entry(hass, entry, entities.extend)
+    backend.weekly_programs = {"primary": _EMPTY_WEEK, "boost": _EMPTY_WEEK}
 
-    schedule_button = next(
-        entity for entity in entities if entity.unique_id.endswith("log_schedule")
-    )
+    schedule_button = _make_schedule_button(runtime, entry)
 
     runtime.controller = None
 
@@ -378,58 +373,29 @@ async def test_schedule_button_requires_controller() -> None:
     assert backend.read_calls == []
 
 
-@pytest.mark.asyncio
-async def test_boost_button_backend_error(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Convert backend failures into Home Assistant errors."""
-
-    runtime, backend = _create_runtime()
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
-
-    await async_setup_entry(hass, entry, entities.extend)
-
-    boost_button = next(
-        entity for entity in entities if entity.unique_id.endswith("boost_30")
-    )
-
-    async def _raise(*args: Any, **kwargs: Any) -> None:
-        raise BeanbagError("boom")
-
-    monkeypatch.setattr(backend, "start_timed_boost", _raise)
-
-    with pytest.raises(HomeAssistantError):
-        await boost_button.async_press()
-
-    assert runtime.timed_boost_active is not True
-
-
-@pytest.mark.asyncio
-async def test_cancel_button_behaviour(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_cancel_button_behaviour(
+    monkeypatch: pytest.MonkeyPatch,
+    runtime: SecuremtrRuntimeData,
+    backend: DummyBackend,
+    entry: SimpleNamespace,
+    fake_hass: SimpleNamespace,
+) -> None:
     """Verify the cancel button reports availability and stops boosts."""
 
-    runtime, backend = _create_runtime()
     runtime.timed_boost_active = True
     runtime.timed_boost_end_minute = 615
-    runtime.timed_boost_end_time = coerce_end_time(615)
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
-
-    await async_setup_entry(hass, entry, entities.extend)
+    runtime.timed_boost_end_time = _END_TIME_615
 
-    cancel_button = next(
-        entity for entity in entities if entity.unique_id.endswith("boost_cancel")
-    )
-    assert isinstance(cancel_button, SecuremtrCancelBoostButton)
+    cancel_button = _make_cancel_button(runtime, entry)
     assert cancel_button.available is True
 
     monkeypatch.setattr(
-        "custom_components.securemtr.button.async_dispatch_runtime_update",
+        button_platform,
+        "async_dispatch_runtime_update",
         lambda hass_obj, entry_id: None,
     )
 
-    cancel_button.hass = SimpleNamespace()
+    cancel_button.hass = fake_hass
     await cancel_button.async_press()
 
     assert backend.stop_calls == [
@@ -444,7 +410,7 @@ async def test_cancel_button_behaviour(monkeypatch: pytest.MonkeyPatch) -> None:
 
     runtime.timed_boost_active = True
     runtime.timed_boost_end_minute = 615
-    runtime.timed_boost_end_time = coerce_end_time(615)
+    runtime.timed_boost_end_time = _END_TIME_615
     cancel_button.hass = None
     await cancel_button.async_press()
     assert backend.stop_calls[-1] == (
@@ -454,22 +420,17 @@ async def test_cancel_button_behaviour(monkeypatch: pytest.MonkeyPatch) -> None:
     )
 
 
-@pytest.mark.asyncio
-async def test_cancel_button_requires_connection() -> None:
+async def test_cancel_button_requires_connection(
+    runtime: SecuremtrRuntimeData,
+    backend: DummyBackend,
+    entry: SimpleNamespace,
+) -> None:
     """Ensure cancellation raises when the runtime is disconnected."""
 
-    runtime, backend = _create_runtime()
     runtime.session = None
     runtime.timed_boost_active = True
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
-
-    await async_setup_entry(hass, entry, entities.extend)
 
-    cancel_button = next(
-        entity for entity in entities if entity.unique_id.endswith("boost_cancel")
-    )
+    cancel_button = _make_cancel_button(runtime, entry)
 
     with pytest.raises(HomeAssistantError):
         await cancel_button.async_press()
@@ -477,21 +438,16 @@ async def test_cancel_button_requires_connection() -> None:
     assert backend.stop_calls == []
 
 
-@pytest.mark.asyncio
-async def test_cancel_button_requires_controller() -> None:
+async def test_cancel_button_requires_controller(
+    runtime: SecuremtrRuntimeData,
+    backend: DummyBackend,
+    entry: SimpleNamespace,
+) -> None:
     """Ensure the cancel button validates controller availability."""
 
-    runtime, backend = _create_runtime()
     runtime.timed_boost_active = True
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
 
-    await async_setup_entry(hass, entry, entities.extend)
-
-    cancel_button = next(
-        entity for entity in entities if entity.unique_id.endswith("boost_cancel")
-    )
+    cancel_button = _make_cancel_button(runtime, entry)
 
     runtime.controller = None
 
@@ -501,26 +457,24 @@ async def test_cancel_button_requires_controller() -> None:
     assert backend.stop_calls == []
 
 
-@pytest.mark.asyncio
-async def test_cancel_button_backend_error(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_cancel_button_backend_error(
+    monkeypatch: pytest.MonkeyPatch,
+    runtime: SecuremtrRuntimeData,
+    backend: DummyBackend,
+    entry: SimpleNamespace,
+    fake_hass: SimpleNamespace,
+) -> None:
     """Ensure backend failures propagate for cancellation."""
 
-    runtime, backend = _create_runtime()
     runtime.timed_boost_active = True
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
-    entities: list[ButtonEntity] = []
 
-    await async_setup_entry(hass, entry, entities.extend)
-
-    cancel_button = next(
-        entity for entity in entities if entity.unique_id.endswith("boost_cancel")
-    )
+    cancel_button = _make_cancel_button(runtime, entry)
     monkeypatch.setattr(
-        "custom_components.securemtr.button.async_dispatch_runtime_update",
+        button_platform,
+        "async_dispatch_runtime_update",
         lambda hass_obj, entry_id: None,
     )
-    cancel_button.hass = SimpleNamespace()
+    cancel_button.hass = fake_hass
 
     async def _raise(*args: Any, **kwargs: Any) -> None:
         raise BeanbagError("boom")
@@ -533,54 +487,57 @@ async def test_cancel_button_backend_error(monkeypatch: pytest.MonkeyPatch) -> N
     assert runtime.timed_boost_active is True
 
 
-@pytest.mark.asyncio
-async def test_button_setup_times_out(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_button_setup_times_out(
+    monkeypatch: pytest.MonkeyPatch,
+    runtime: SecuremtrRuntimeData,
+    runtime_hass: SimpleNamespace,
+    entry: SimpleNamespace,
+    discard_entities: Callable[[Iterable[Any]], None],
+) -> None:
     """Ensure setup raises when controller metadata is delayed."""
 
-    runtime, _backend = _create_runtime()
     runtime.controller_ready = asyncio.Event()
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
 
-    monkeypatch.setattr(
-        "custom_components.securemtr.button._CONTROLLER_WAIT_TIMEOUT", 0.01
-    )
+    monkeypatch.setattr(button_platform, "_CONTROLLER_WAIT_TIMEOUT", 0.01)
 
     with pytest.raises(HomeAssistantError):
-        await async_setup_entry(hass, entry, lambda entities: None)
+        await async_setup_entry(runtime_hass, entry, discard_entities)
 
 
-@pytest.mark.asyncio
-async def test_button_setup_requires_controller() -> None:
+async def test_button_setup_requires_controller(
+    runtime: SecuremtrRuntimeData,
+    runtime_hass: SimpleNamespace,
+    entry: SimpleNamespace,
+    discard_entities: Callable[[Iterable[Any]], None],
+) -> None:
     """Ensure setup raises when the runtime lacks controller metadata."""
 
-    runtime, _backend = _create_runtime()
     runtime.controller = None
-    hass = SimpleNamespace(data={DOMAIN: {"entry": runtime}})
-    entry = DummyEntry(entry_id="entry")
 
     with pytest.raises(HomeAssistantError):
-        await async_setup_entry(hass, entry, lambda entities: None)
+        await async_setup_entry(runtime_hass, entry, discard_entities)
 
 
-@pytest.mark.asyncio
-async def test_button_async_added_to_hass(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_button_async_added_to_hass(
+    monkeypatch: pytest.MonkeyPatch,
+    runtime: SecuremtrRuntimeData,
+    dispatcher_connections: list[tuple[object, str, Any]],
+    entry: SimpleNamespace,
+    fake_hass: SimpleNamespace,
+) -> None:
     """Ensure dispatcher callbacks are registered when the entity is added."""
 
-    runtime, _backend = _create_runtime()
-    button = SecuremtrTimedBoostButton(runtime, runtime.controller, DummyEntry("entry"), 30)
-    button.hass = SimpleNamespace()
+    button = _make_boost_button(runtime, entry)
+    button.hass = fake_hass
 
     added_calls: list[SecuremtrTimedBoostButton] = []
 
     async def _fake_added(self: SecuremtrTimedBoostButton) -> None:
         added_calls.append(self)
 
-    connections: list[tuple[object, str, Any]] = []
-
-    def _connect(hass_obj: object, signal: str, callback: Any) -> Any:
-        connections.append((hass_obj, signal, callback))
-        return lambda: None
+    monkeypatch.setattr(
+        button_platform.ButtonEntity, "async_added_to_hass", _fake_added
+    )
 
     removals: list[Any] = []
 
@@ -589,47 +546,38 @@ async def test_button_async_added_to_hass(monkeypatch: pytest.MonkeyPatch) -> No
 
     button.async_on_remove = _record_remove  # type: ignore[assignment]
 
-    with pytest.MonkeyPatch.context() as mp:
-        mp.setattr(
-            "custom_components.securemtr.button.ButtonEntity.async_added_to_hass",
-            _fake_added,
-        )
-        mp.setattr(
-            "custom_components.securemtr.button.async_dispatcher_connect",
-            _connect,
-        )
-        await button.async_added_to_hass()
+    await button.async_added_to_hass()
 
     assert added_calls
-    assert connections[0][0] is button.hass
+    assert dispatcher_connections[0][0] is button.hass
     assert removals
 
     button.hass = None
     await button.async_added_to_hass()
+    assert len(dispatcher_connections) == 1
 
 
-@pytest.mark.asyncio
-async def test_consumption_button_triggers_refresh(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_consumption_button_triggers_refresh(
+    monkeypatch: pytest.MonkeyPatch,
+    runtime: SecuremtrRuntimeData,
+    entry: SimpleNamespace,
+    fake_hass: SimpleNamespace,
+) -> None:
     """Ensure pressing the consumption button refreshes metrics."""
 
-    runtime, _backend = _create_runtime()
-    hass = SimpleNamespace()
-    entry = DummyEntry(entry_id="entry")
     button = SecuremtrConsumptionMetricsButton(runtime, runtime.controller, entry)
-    button.hass = hass
+    button.hass = fake_hass
 
-    calls: list[tuple[object, DummyEntry]] = []
+    calls: list[tuple[object, SimpleNamespace]] = []
 
-    async def _fake_refresh(hass_obj: object, entry_obj: DummyEntry) -> None:
+    async def _fake_refresh(hass_obj: object, entry_obj: SimpleNamespace) -> None:
         calls.append((hass_obj, entry_obj))
 
-    monkeypatch.setattr(
-        "custom_components.securemtr.button.consumption_metrics", _fake_refresh
-    )
+    monkeypatch.setattr(button_platform, "consumption_metrics", _fake_refresh)
 
     await button.async_press()
 
-    assert calls == [(hass, entry)]
+    assert calls == [(fake_hass, entry)]
 
     button.hass = None
     with pytest.raises(HomeAssistantError):
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
 import hashlib
 import logging
 from pathlib import Path
-from types import SimpleNamespace
-import sys
 from datetime import time
+from typing import Any
 from unittest.mock import AsyncMock, Mock
 
+from aiohttp import ClientWebSocketResponse
 import pytest
 import pytest_asyncio
 from pytest import TempPathFactory
@@ -17,10 +19,7 @@ from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, CONF_TIME_ZONE
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
-
+import custom_components.securemtr as securemtr_mod
 from custom_components.securemtr import (
     DOMAIN,
     SecuremtrRuntimeData,
@@ -28,7 +27,11 @@ from custom_components.securemtr import (
     async_setup_entry,
     async_unload_entry,
 )
-from custom_components.securemtr.beanbag import BeanbagGateway, BeanbagSession
+from custom_components.securemtr.beanbag import (
+    BeanbagBackend,
+    BeanbagGateway,
+    BeanbagSession,
+)
 import custom_components.securemtr.config_flow as config_flow
 from custom_components.securemtr.config_flow import (
     CONF_ANCHOR_STRATEGY,
@@ -43,16 +46,16 @@ from custom_components.securemtr.config_flow import (
     DEFAULT_PREFER_DEVICE_ENERGY,
     DEFAULT_PRIMARY_ANCHOR,
     SecuremtrConfigFlow,
+    SecuremtrOptionsFlowHandler,
     _anchor_option_to_time,
     _serialize_anchor,
 )
 
-@pytest_asyncio.fixture
-async def hass_fixture(tmp_path_factory: TempPathFactory) -> HomeAssistant:
-    """Provide a Home Assistant instance for tests."""
+@pytest_asyncio.fixture(scope="module")
+async def shared_hass(tmp_path_factory: TempPathFactory) -> AsyncIterator[HomeAssistant]:
+    """Start one Home Assistant instance for the whole module."""
     config_dir: Path = tmp_path_factory.mktemp("securemtr")
     hass = HomeAssistant(config_dir=str(config_dir))
-    hass.data.clear()
     await hass.async_start()
     try:
         yield hass
@@ -60,101 +63,133 @@ async def hass_fixture(tmp_path_factory: TempPathFactory) -> HomeAssistant:
         await hass.async_stop()
 
 
-class DummyWebSocket:
-    """Provide a closable WebSocket stand-in."""
+@pytest.fixture
+def hass_fixture(shared_hass: HomeAssistant) -> Iterator[HomeAssistant]:
+    """Provide the shared instance and check a test left no entry or listener."""
+    baseline = set(shared_hass.data)
+    listeners = shared_hass.bus.async_listeners()
+    yield shared_hass
+    assert not shared_hass.data.get(DOMAIN), "test left a securemtr entry loaded"
+    assert shared_hass.bus.async_listeners() == listeners
+    for key in set(shared_hass.data) - baseline:
+        del shared_hass.data[key]
+
+
+@pytest_asyncio.fixture
+async def hass_lite(tmp_path: Path) -> HomeAssistant:
+    """Provide an unstarted instance for tests that only touch hass.data.
+
+    Async only because HomeAssistant() binds to the running event loop.
+    """
+    return HomeAssistant(config_dir=str(tmp_path))
+
 
-    def __init__(self) -> None:
-        self.closed = False
+# Stored credential digests for the "secure" and "secret" test passwords.
+_SECURE_MD5 = hashlib.md5(b"secure").hexdigest()
+_SECRET_MD5 = hashlib.md5(b"secret").hexdigest()
 
-    async def close(self) -> None:
-        """Mark the WebSocket as closed."""
+# Stands in for the shared aiohttp session so no real ClientSession is built.
+_FAKE_CLIENT_SESSION = object()
 
-        self.closed = True
 
+@dataclass(slots=True)
+class FakeEntry:
+    """Provide the config entry attributes read by setup, unload and options."""
 
-class DummyBackend:
-    """Return canned session data for backend startup."""
+    entry_id: str = "entry"
+    unique_id: str | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+    options: dict[str, Any] = field(default_factory=dict)
 
-    def __init__(self) -> None:
-        self.login_calls: list[tuple[str, str]] = []
-        self.session = BeanbagSession(
-            user_id=42,
-            session_id="session-id",
-            token="jwt-token",
-            token_timestamp=None,
-            gateways=(
-                BeanbagGateway(
-                    gateway_id="gateway-1",
-                    serial_number="serial-1",
-                    host_name="host-name",
-                    capabilities={},
-                ),
-            ),
-        )
-        self.websocket = DummyWebSocket()
-        self.metadata_calls: list[str] = []
 
-    async def login_and_connect(
-        self, email: str, password_digest: str
-    ) -> tuple[BeanbagSession, DummyWebSocket]:
-        """Record credentials and return canned session details."""
+@dataclass(slots=True)
+class FakeConfig:
+    """Expose the configured Home Assistant time zone."""
 
-        self.login_calls.append((email, password_digest))
-        return self.session, self.websocket
+    time_zone: str | None
+
+
+@dataclass(slots=True)
+class FakeHass:
+    """Expose the Home Assistant configuration read by the flows."""
+
+    config: FakeConfig
+
+
+# The user step never reads from hass, so the flow tests skip the real core.
+_FLOW_HASS = FakeHass(FakeConfig(time_zone=None))
+
+
+_SESSION = BeanbagSession(
+    user_id=42,
+    session_id="session-id",
+    token="jwt-token",
+    token_timestamp=None,
+    gateways=(
+        BeanbagGateway(
+            gateway_id="gateway-1",
+            serial_number="serial-1",
+            host_name="host-name",
+            capabilities={},
+        ),
+    ),
+)
 
-    async def read_device_metadata(
-        self, session: BeanbagSession, websocket: DummyWebSocket, gateway_id: str
-    ) -> dict[str, str]:
-        """Return canned metadata for the configured controller."""
+_METADATA = {
+    "BOI": "controller-1",
+    "N": "Test Controller",
+    "SN": "serial-1",
+    "FV": "1.0.0",
+    "MD": "E7+",
+}
 
-        self.metadata_calls.append(gateway_id)
-        return {
-            "BOI": "controller-1",
-            "N": "Test Controller",
-            "SN": "serial-1",
-            "FV": "1.0.0",
-            "MD": "E7+",
-        }
+
+@pytest.fixture(scope="module")
+def shared_backend() -> AsyncMock:
+    """Build the canned backend mock once for the whole module."""
+
+    websocket = AsyncMock(spec=ClientWebSocketResponse)
+    backend = AsyncMock(spec=BeanbagBackend)
+    backend.login_and_connect.return_value = (_SESSION, websocket)
+    backend.read_device_metadata.return_value = _METADATA
+    return backend
 
 
 @pytest.fixture
-def backend_patch(monkeypatch: pytest.MonkeyPatch) -> DummyBackend:
+def backend_patch(
+    monkeypatch: pytest.MonkeyPatch, shared_backend: AsyncMock
+) -> AsyncMock:
     """Stub Beanbag backend construction during tests."""
 
-    fake_session = object()
-    backend = DummyBackend()
+    _, websocket = shared_backend.login_and_connect.return_value
+    shared_backend.reset_mock()
+    websocket.reset_mock()
+    websocket.closed = False
 
     monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
+        securemtr_mod, "async_get_clientsession", lambda hass: _FAKE_CLIENT_SESSION
     )
+    monkeypatch.setattr(securemtr_mod, "BeanbagBackend", lambda session: shared_backend)
 
-    return backend
+    return shared_backend
 
 
-@pytest.mark.asyncio
 async def test_async_setup_initializes_domain_storage(
-    hass_fixture: HomeAssistant,
+    hass_lite: HomeAssistant,
 ) -> None:
     """Ensure async_setup prepares storage for the integration."""
-    assert await async_setup(hass_fixture, {})
-    assert hass_fixture.data[DOMAIN] == {}
+    assert await async_setup(hass_lite, {})
+    assert hass_lite.data[DOMAIN] == {}
 
 
-@pytest.mark.asyncio
 async def test_async_setup_entry_stores_entry_data(
-    hass_fixture: HomeAssistant, backend_patch: DummyBackend
+    hass_fixture: HomeAssistant, backend_patch: AsyncMock
 ) -> None:
     """Ensure async_setup_entry keeps the provided credential data."""
-    hashed_password = hashlib.md5("secure".encode("utf-8")).hexdigest()
-    entry = SimpleNamespace(
+    entry = FakeEntry(
         entry_id="entry-1",
         unique_id="user@example.com",
-        data={CONF_EMAIL: "user@example.com", CONF_PASSWORD: hashed_password},
+        data={CONF_EMAIL: "user@example.com", CONF_PASSWORD: _SECURE_MD5},
     )
 
     assert await async_setup_entry(hass_fixture, entry)
@@ -162,17 +197,21 @@ async def test_async_setup_entry_stores_entry_data(
 
     runtime = hass_fixture.data[DOMAIN][entry.entry_id]
     assert isinstance(runtime, SecuremtrRuntimeData)
-    assert runtime.session is backend_patch.session
-    assert runtime.websocket is backend_patch.websocket
-    assert backend_patch.login_calls == [("user@example.com", hashed_password)]
+    assert runtime.session is _SESSION
+    assert runtime.websocket is backend_patch.login_and_connect.return_value[1]
+    backend_patch.login_and_connect.assert_awaited_once_with(
+        "user@example.com", _SECURE_MD5
+    )
+
+    assert await async_unload_entry(hass_fixture, entry)
+    assert runtime.consumption_schedule_unsub is None
 
 
-@pytest.mark.asyncio
 async def test_async_unload_entry_removes_entry_data(
-    hass_fixture: HomeAssistant, backend_patch: DummyBackend
+    hass_fixture: HomeAssistant, backend_patch: AsyncMock
 ) -> None:
     """Ensure async_unload_entry clears stored data."""
-    entry = SimpleNamespace(
+    entry = FakeEntry(
         entry_id="entry-2",
         unique_id="user@example.com",
         data={CONF_EMAIL: "user@example.com", CONF_PASSWORD: "digest"},
@@ -183,14 +222,14 @@ async def test_async_unload_entry_removes_entry_data(
 
     assert await async_unload_entry(hass_fixture, entry)
     assert "entry-2" not in hass_fixture.data[DOMAIN]
-    assert backend_patch.websocket.closed
+    websocket = backend_patch.login_and_connect.return_value[1]
+    websocket.close.assert_awaited_once_with()
 
 
-@pytest.mark.asyncio
-async def test_config_flow_shows_form(hass_fixture: HomeAssistant) -> None:
+async def test_config_flow_shows_form() -> None:
     """Verify the config flow displays the initial form."""
     flow = SecuremtrConfigFlow()
-    flow.hass = hass_fixture
+    flow.hass = _FLOW_HASS
 
     result = await flow.async_step_user()
 
@@ -198,11 +237,10 @@ async def test_config_flow_shows_form(hass_fixture: HomeAssistant) -> None:
     assert result["step_id"] == "user"
 
 
-@pytest.mark.asyncio
-async def test_config_flow_creates_entry(hass_fixture: HomeAssistant) -> None:
+async def test_config_flow_creates_entry() -> None:
     """Verify a config entry is created with sanitized credentials."""
     flow = SecuremtrConfigFlow()
-    flow.hass = hass_fixture
+    flow.hass = _FLOW_HASS
 
     flow.async_set_unique_id = AsyncMock()
     flow._abort_if_unique_id_configured = Mock()
@@ -211,25 +249,20 @@ async def test_config_flow_creates_entry(hass_fixture: HomeAssistant) -> None:
         {CONF_EMAIL: " User@Example.com ", CONF_PASSWORD: "secret"}
     )
 
-    expected_hash = hashlib.md5("secret".encode("utf-8")).hexdigest()
-
     assert result["type"] == FlowResultType.CREATE_ENTRY
     assert result["title"] == "SecureMTR"
     assert result["data"] == {
         CONF_EMAIL: "User@Example.com",
-        CONF_PASSWORD: expected_hash,
+        CONF_PASSWORD: _SECRET_MD5,
     }
     flow.async_set_unique_id.assert_awaited_once_with("user@example.com")
     flow._abort_if_unique_id_configured.assert_called_once()
 
 
-@pytest.mark.asyncio
-async def test_config_flow_rejects_long_password(
-    hass_fixture: HomeAssistant,
-) -> None:
+async def test_config_flow_rejects_long_password() -> None:
     """Ensure config flow rejects passwords longer than the mobile app allows."""
     flow = SecuremtrConfigFlow()
-    flow.hass = hass_fixture
+    flow.hass = _FLOW_HASS
 
     flow.async_set_unique_id = AsyncMock()
     flow._abort_if_unique_id_configured = Mock()
@@ -244,125 +277,104 @@ async def test_config_flow_rejects_long_password(
     flow._abort_if_unique_id_configured.assert_not_called()
 
 
-@pytest.mark.asyncio
-async def test_options_flow_uses_default_values() -> None:
-    """Ensure the options flow exposes documented defaults."""
+def _options_handler(
+    options: dict[str, Any], time_zone: str | None
+) -> SecuremtrOptionsFlowHandler:
+    """Build an options flow handler for the stored options and hass timezone."""
 
-    handler = SecuremtrConfigFlow.async_get_options_flow(SimpleNamespace(options={}))
-    handler.hass = SimpleNamespace(config=SimpleNamespace(time_zone="Europe/Dublin"))
+    handler = SecuremtrConfigFlow.async_get_options_flow(FakeEntry(options=options))
+    handler.hass = FakeHass(FakeConfig(time_zone=time_zone))
+    return handler
 
-    result = await handler.async_step_init()
-    assert result["type"] == FlowResultType.FORM
-    defaults = result["data_schema"]({})
 
-    assert defaults[CONF_PRIMARY_ANCHOR] == time.fromisoformat(DEFAULT_PRIMARY_ANCHOR)
-    assert defaults[CONF_BOOST_ANCHOR] == time.fromisoformat(DEFAULT_BOOST_ANCHOR)
-    assert defaults[CONF_ANCHOR_STRATEGY] == DEFAULT_ANCHOR_STRATEGY
-    assert defaults[CONF_ELEMENT_POWER_KW] == DEFAULT_ELEMENT_POWER_KW
-    assert defaults[CONF_PREFER_DEVICE_ENERGY] == DEFAULT_PREFER_DEVICE_ENERGY
+_DEFAULT_FORM_VALUES = {
+    CONF_PRIMARY_ANCHOR: time.fromisoformat(DEFAULT_PRIMARY_ANCHOR),
+    CONF_BOOST_ANCHOR: time.fromisoformat(DEFAULT_BOOST_ANCHOR),
+    CONF_ANCHOR_STRATEGY: DEFAULT_ANCHOR_STRATEGY,
+    CONF_ELEMENT_POWER_KW: DEFAULT_ELEMENT_POWER_KW,
+    CONF_PREFER_DEVICE_ENERGY: DEFAULT_PREFER_DEVICE_ENERGY,
+}
 
+_OPTIONS_INPUT = {
+    CONF_PRIMARY_ANCHOR: time(4, 30),
+    CONF_BOOST_ANCHOR: time(19, 0, 15),
+    CONF_ANCHOR_STRATEGY: "fixed",
+    CONF_ELEMENT_POWER_KW: 3.25,
+    CONF_PREFER_DEVICE_ENERGY: False,
+}
 
-@pytest.mark.asyncio
-async def test_options_flow_prefers_stored_values() -> None:
-    """Ensure stored options are respected as defaults."""
 
-    handler = SecuremtrConfigFlow.async_get_options_flow(
-        SimpleNamespace(
-            options={
+@pytest.mark.parametrize(
+    ("stored_options", "expected"),
+    [
+        ({}, _DEFAULT_FORM_VALUES),
+        (
+            {
                 CONF_PRIMARY_ANCHOR: "06:15",
                 CONF_BOOST_ANCHOR: "18:45:30",
                 CONF_ANCHOR_STRATEGY: "strange",
                 CONF_ELEMENT_POWER_KW: "3.1",
                 CONF_PREFER_DEVICE_ENERGY: False,
-            }
-        )
-    )
-    handler.hass = SimpleNamespace(config=SimpleNamespace(time_zone="Europe/Dublin"))
-
-    result = await handler.async_step_init()
-    defaults = result["data_schema"]({})
-
-    assert defaults[CONF_PRIMARY_ANCHOR] == time(6, 15)
-    assert defaults[CONF_BOOST_ANCHOR] == time(18, 45, 30)
-    assert defaults[CONF_ANCHOR_STRATEGY] == DEFAULT_ANCHOR_STRATEGY
-    assert defaults[CONF_ELEMENT_POWER_KW] == pytest.approx(3.1)
-    assert defaults[CONF_PREFER_DEVICE_ENERGY] is False
-
-
-@pytest.mark.asyncio
-async def test_options_flow_creates_entry_with_serialized_times() -> None:
-    """Ensure anchor times are serialized to ISO strings when saved."""
-
-    handler = SecuremtrConfigFlow.async_get_options_flow(SimpleNamespace(options={}))
-    handler.hass = SimpleNamespace(config=SimpleNamespace(time_zone="Europe/Paris"))
-
-    result = await handler.async_step_init(
-        {
-            CONF_PRIMARY_ANCHOR: time(4, 30),
-            CONF_BOOST_ANCHOR: time(19, 0, 15),
-            CONF_ANCHOR_STRATEGY: "fixed",
-            CONF_ELEMENT_POWER_KW: 3.25,
-            CONF_PREFER_DEVICE_ENERGY: False,
-        }
-    )
-
-    assert result["type"] == FlowResultType.CREATE_ENTRY
-    assert result["data"] == {
-        CONF_TIME_ZONE: "Europe/Paris",
-        CONF_PRIMARY_ANCHOR: "04:30",
-        CONF_BOOST_ANCHOR: "19:00:15",
-        CONF_ANCHOR_STRATEGY: "fixed",
-        CONF_ELEMENT_POWER_KW: 3.25,
-        CONF_PREFER_DEVICE_ENERGY: False,
-    }
-
-
-@pytest.mark.asyncio
-async def test_options_flow_falls_back_to_default_timezone(caplog: pytest.LogCaptureFixture) -> None:
-    """Ensure the options flow falls back when Home Assistant lacks a timezone."""
-
-    handler = SecuremtrConfigFlow.async_get_options_flow(SimpleNamespace(options={}))
-    handler.hass = SimpleNamespace(config=SimpleNamespace(time_zone=None))
-
-    with caplog.at_level(logging.WARNING):
-        result = await handler.async_step_init(
+            },
             {
-                CONF_PRIMARY_ANCHOR: time(4, 30),
-                CONF_BOOST_ANCHOR: time(19, 0, 15),
-                CONF_ANCHOR_STRATEGY: "fixed",
-                CONF_ELEMENT_POWER_KW: 3.25,
+                CONF_PRIMARY_ANCHOR: time(6, 15),
+                CONF_BOOST_ANCHOR: time(18, 45, 30),
+                CONF_ANCHOR_STRATEGY: DEFAULT_ANCHOR_STRATEGY,
+                CONF_ELEMENT_POWER_KW: pytest.approx(3.1),
                 CONF_PREFER_DEVICE_ENERGY: False,
-            }
-        )
+            },
+        ),
+    ],
+    ids=["defaults", "stored"],
+)
+async def test_options_flow_form_defaults(
+    stored_options: dict[str, Any], expected: dict[str, Any]
+) -> None:
+    """Ensure the options form defaults to stored values or integration defaults."""
 
-    assert result["type"] == FlowResultType.CREATE_ENTRY
-    assert result["data"][CONF_TIME_ZONE] == DEFAULT_TIMEZONE
-    assert "timezone unavailable" in caplog.text
+    handler = _options_handler(stored_options, "Europe/Dublin")
+
+    result = await handler.async_step_init()
+    assert result["type"] == FlowResultType.FORM
+
+    assert result["data_schema"]({}) == expected
 
 
-@pytest.mark.asyncio
-async def test_options_flow_handles_invalid_home_assistant_timezone(
+@pytest.mark.parametrize(
+    ("ha_time_zone", "expected_time_zone", "warning"),
+    [
+        ("Europe/Paris", "Europe/Paris", None),
+        (None, DEFAULT_TIMEZONE, "timezone unavailable"),
+        ("Mars/Olympus", DEFAULT_TIMEZONE, "Invalid Home Assistant timezone"),
+    ],
+    ids=["ha_timezone", "missing_timezone", "invalid_timezone"],
+)
+async def test_options_flow_creates_entry_with_serialized_times(
     caplog: pytest.LogCaptureFixture,
+    ha_time_zone: str | None,
+    expected_time_zone: str,
+    warning: str | None,
 ) -> None:
-    """Ensure the options flow logs and falls back when the Home Assistant timezone is invalid."""
+    """Ensure saved options serialize anchors and resolve the timezone."""
 
-    handler = SecuremtrConfigFlow.async_get_options_flow(SimpleNamespace(options={}))
-    handler.hass = SimpleNamespace(config=SimpleNamespace(time_zone="Mars/Olympus"))
+    handler = _options_handler({}, ha_time_zone)
 
     with caplog.at_level(logging.WARNING):
-        result = await handler.async_step_init(
-            {
-                CONF_PRIMARY_ANCHOR: time(4, 30),
-                CONF_BOOST_ANCHOR: time(19, 0, 15),
-                CONF_ANCHOR_STRATEGY: "fixed",
-                CONF_ELEMENT_POWER_KW: 3.25,
-                CONF_PREFER_DEVICE_ENERGY: False,
-            }
-        )
+        result = await handler.async_step_init(dict(_OPTIONS_INPUT))
 
     assert result["type"] == FlowResultType.CREATE_ENTRY
-    assert result["data"][CONF_TIME_ZONE] == DEFAULT_TIMEZONE
-    assert "Invalid Home Assistant timezone" in caplog.text
+    assert result["data"] == {
+        CONF_TIME_ZONE: expected_time_zone,
+        CONF_PRIMARY_ANCHOR: "04:30",
+        CONF_BOOST_ANCHOR: "19:00:15",
+        CONF_ANCHOR_STRATEGY: "fixed",
+        CONF_ELEMENT_POWER_KW: 3.25,
+        CONF_PREFER_DEVICE_ENERGY: False,
+    }
+    if warning is None:
+        assert not caplog.records
+    else:
+        assert warning in caplog.text
 
 
 def test_anchor_option_to_time_variants(caplog: pytest.LogCaptureFixture) -> None:
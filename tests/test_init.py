@@ -3,16 +3,21 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
-from dataclasses import dataclass, field
+from collections import defaultdict, deque
+from collections.abc import Callable, Coroutine
+from contextlib import suppress
+from dataclasses import dataclass, field, replace
 from datetime import datetime, time, timezone
 from itertools import accumulate
-from typing import Any, Awaitable
+from typing import Any
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest
 
+import custom_components.securemtr as securemtr_mod
 from custom_components.securemtr import (
     DOMAIN,
     SecuremtrController,
@@ -68,9 +73,26 @@ class DummyConfigEntry:
     hass: Any | None = None
 
 
+# Template for make_entry; its credentials and options are shared read-only.
+_BASE_ENTRY = DummyConfigEntry(
+    entry_id="0",
+    unique_id="user@example.com",
+    data={"email": "user@example.com", "password": "digest"},
+    title="SecureMTR",
+)
+
+
+def make_entry(entry_id: str, **overrides: Any) -> DummyConfigEntry:
+    """Derive an entry from the shared template with a new ID and overrides."""
+
+    return replace(_BASE_ENTRY, entry_id=entry_id, **overrides)
+
+
 class FakeWebSocket:
     """Represent a simple closable WebSocket stub."""
 
+    __slots__ = ("closed", "close_calls")
+
     def __init__(self) -> None:
         self.closed = False
         self.close_calls = 0
@@ -178,48 +200,133 @@ def fake_entity_registry(monkeypatch: pytest.MonkeyPatch) -> None:
     )
 
 
+# Canned backend payloads are built once; the integration never mutates them.
+_CANNED_SESSION = BeanbagSession(
+    user_id=1,
+    session_id="session-id",
+    token="jwt-token",
+    token_timestamp=None,
+    gateways=(
+        BeanbagGateway(
+            gateway_id="gateway-1",
+            serial_number="serial-1",
+            host_name="host-name",
+            capabilities={},
+        ),
+    ),
+)
+
+_CANNED_METADATA = {
+    "BOI": "controller-1",
+    "N": "E7+ Controller",
+    "SN": "serial-1",
+    "FV": "1.0.0",
+    "MD": "E7+",
+}
+
+_CANNED_STATE_SNAPSHOT = BeanbagStateSnapshot(
+    payload={
+        "V": [
+            {"I": 1, "SI": 33, "V": [{"I": 6, "V": 2}]},
+            {
+                "I": 2,
+                "SI": 16,
+                "V": [
+                    {"I": 4, "V": 0},
+                    {"I": 9, "V": 0},
+                    {"I": 27, "V": 0},
+                ],
+            },
+        ]
+    },
+    primary_power_on=True,
+    timed_boost_enabled=False,
+    timed_boost_active=False,
+    timed_boost_end_minute=None,
+)
+
+# Tests only read the controller, so one instance serves them all.
+_CANNED_CONTROLLER = SecuremtrController(
+    identifier="controller-1",
+    name="E7+",
+    gateway_id="gateway-1",
+)
+
+# _build_controller only reads the gateway, so the controller tests share it.
+_BARE_GATEWAY = BeanbagGateway(
+    gateway_id="gateway-1",
+    serial_number=None,
+    host_name="host",
+    capabilities={},
+)
+
+_BASE_TIMESTAMP = 1_700_000_000
+
+_CANNED_SAMPLES = tuple(
+    BeanbagEnergySample(
+        timestamp=_BASE_TIMESTAMP + offset * 86_400,
+        primary_energy_kwh=1.0 + offset,
+        boost_energy_kwh=0.5 * offset,
+        primary_scheduled_minutes=180 + offset * 10,
+        primary_active_minutes=120 + offset * 10,
+        boost_scheduled_minutes=offset * 15,
+        boost_active_minutes=offset * 5,
+    )
+    for offset in range(8)
+)
+
+# Consumption log rows for the seven most recent samples, in Europe/Dublin.
+_EXPECTED_METRICS_LOG = [
+    {
+        "timestamp": datetime.fromtimestamp(
+            _BASE_TIMESTAMP + offset * 86_400, timezone.utc
+        ).isoformat(),
+        "epoch_seconds": _BASE_TIMESTAMP + offset * 86_400,
+        "report_day": report_day_for_sample(
+            _BASE_TIMESTAMP + offset * 86_400,
+            dt_util.get_time_zone("Europe/Dublin"),
+        ).isoformat(),
+        "primary_energy_kwh": 1.0 + offset,
+        "boost_energy_kwh": 0.5 * offset,
+        "primary_scheduled_minutes": 180 + offset * 10,
+        "primary_active_minutes": 120 + offset * 10,
+        "boost_scheduled_minutes": offset * 15,
+        "boost_active_minutes": offset * 5,
+    }
+    for offset in range(1, 8)
+]
+
+
 class FakeBeanbagBackend:
     """Capture login requests and provide canned responses."""
 
+    __slots__ = ("calls", "session", "websocket")
+
+    # Built once per class; subclasses override these instead of rebuilding them.
+    _session = _CANNED_SESSION
+    _primary_program: WeeklyProgram = tuple(
+        DailyProgram((120, None, None), (240, None, None)) for _ in range(7)
+    )
+    _boost_program: WeeklyProgram = tuple(
+        DailyProgram((1020, None, None), (1080, None, None)) for _ in range(7)
+    )
+
     def __init__(self, session: object) -> None:
         self.session = session
-        self.login_calls: list[tuple[str, str]] = []
-        self.zone_calls: list[str] = []
-        self.clock_calls: list[tuple[str, int]] = []
-        self.schedule_calls: list[str] = []
-        self.metadata_calls: list[str] = []
-        self.configuration_calls: list[str] = []
-        self.state_calls: list[str] = []
-        self.energy_history_calls: list[tuple[str, int]] = []
-        self.program_calls: list[tuple[str, str]] = []
-        self._session = BeanbagSession(
-            user_id=1,
-            session_id="session-id",
-            token="jwt-token",
-            token_timestamp=None,
-            gateways=(
-                BeanbagGateway(
-                    gateway_id="gateway-1",
-                    serial_number="serial-1",
-                    host_name="host-name",
-                    capabilities={},
-                ),
-            ),
-        )
+        self.calls: defaultdict[str, list[Any]] = defaultdict(list)
         self.websocket = FakeWebSocket()
-        self._primary_program: WeeklyProgram = tuple(
-            DailyProgram((120, None, None), (240, None, None)) for _ in range(7)
-        )
-        self._boost_program: WeeklyProgram = tuple(
-            DailyProgram((1020, None, None), (1080, None, None)) for _ in range(7)
-        )
+
+    def _log(self, channel: str, value: Any) -> None:
+        """Record a backend call under the given channel."""
+
+        self.calls[channel].append(value)
 
     async def login_and_connect(
         self, email: str, password_digest: str
     ) -> tuple[BeanbagSession, FakeWebSocket]:
         """Record the credentials and return canned connection artefacts."""
 
-        self.login_calls.append((email, password_digest))
+        self._log("login", (email, password_digest))
         return self._session, self.websocket
 
     async def read_device_metadata(
@@ -227,21 +334,15 @@ class FakeBeanbagBackend:
     ) -> dict[str, str]:
         """Return canned metadata for the sole controller."""
 
-        self.metadata_calls.append(gateway_id)
-        return {
-            "BOI": "controller-1",
-            "N": "E7+ Controller",
-            "SN": "serial-1",
-            "FV": "1.0.0",
-            "MD": "E7+",
-        }
+        self._log("metadata", gateway_id)
+        return _CANNED_METADATA
 
     async def read_zone_topology(
         self, session: BeanbagSession, websocket: FakeWebSocket, gateway_id: str
     ) -> list[dict[str, str]]:
         """Return a single synthetic zone entry."""
 
-        self.zone_calls.append(gateway_id)
+        self._log("zone", gateway_id)
         return [{"ZN": 1, "ZNM": "Primary"}]
 
     async def sync_gateway_clock(
@@ -254,14 +355,14 @@ class FakeBeanbagBackend:
     ) -> None:
         """Record the timestamp used for controller clock alignment."""
 
-        self.clock_calls.append((gateway_id, int(timestamp or 0)))
+        self._log("clock", (gateway_id, int(timestamp or 0)))
 
     async def read_schedule_overview(
         self, session: BeanbagSession, websocket: FakeWebSocket, gateway_id: str
     ) -> dict[str, list[object]]:
         """Return a canned schedule overview payload."""
 
-        self.schedule_calls.append(gateway_id)
+        self._log("schedule", gateway_id)
         return {"V": []}
 
     async def read_device_configuration(
@@ -269,7 +370,7 @@ class FakeBeanbagBackend:
     ) -> dict[str, list[object]]:
         """Return canned configuration data."""
 
-        self.configuration_calls.append(gateway_id)
+        self._log("configuration", gateway_id)
         return {"V": []}
 
     async def read_live_state(
@@ -277,28 +378,8 @@ class FakeBeanbagBackend:
     ) -> BeanbagStateSnapshot:
         """Return a state snapshot with the primary power enabled."""
 
-        self.state_calls.append(gateway_id)
-        payload = {
-            "V": [
-                {"I": 1, "SI": 33, "V": [{"I": 6, "V": 2}]},
-                {
-                    "I": 2,
-                    "SI": 16,
-                    "V": [
-                        {"I": 4, "V": 0},
-                        {"I": 9, "V": 0},
-                        {"I": 27, "V": 0},
-                    ],
-                },
-            ]
-        }
-        return BeanbagStateSnapshot(
-            payload=payload,
-            primary_power_on=True,
-            timed_boost_enabled=False,
-            timed_boost_active=False,
-            timed_boost_end_minute=None,
-        )
+        self._log("state", gateway_id)
+        return _CANNED_STATE_SNAPSHOT
 
     async def read_energy_history(
         self,
@@ -310,22 +391,8 @@ class FakeBeanbagBackend:
     ) -> list[BeanbagEnergySample]:
         """Return a canned set of energy samples."""
 
-        self.energy_history_calls.append((gateway_id, window_index))
-        samples: list[BeanbagEnergySample] = []
-        base_timestamp = 1_700_000_000
-        for offset in range(8):
-            samples.append(
-                BeanbagEnergySample(
-                    timestamp=base_timestamp + offset * 86_400,
-                    primary_energy_kwh=1.0 + offset,
-                    boost_energy_kwh=0.5 * offset,
-                    primary_scheduled_minutes=180 + offset * 10,
-                    primary_active_minutes=120 + offset * 10,
-                    boost_scheduled_minutes=offset * 15,
-                    boost_active_minutes=offset * 5,
-                )
-            )
-        return samples
+        self._log("energy_history", (gateway_id, window_index))
+        return list(_CANNED_SAMPLES)
 
     async def read_weekly_program(
         self,
@@ -337,7 +404,7 @@ class FakeBeanbagBackend:
     ) -> WeeklyProgram:
         """Return a weekly program for the requested zone."""
 
-        self.program_calls.append((zone, gateway_id))
+        self._log("program", (zone, gateway_id))
         if zone == "primary":
             return self._primary_program
         if zone == "boost":
@@ -349,17 +416,40 @@ class FakeBeanbagBackend:
     ) -> None:
         """Pretend to send the power-on command."""
 
-        self.state_calls.append(f"on:{gateway_id}")
+        self._log("state", f"on:{gateway_id}")
 
     async def turn_controller_off(
         self, session: BeanbagSession, websocket: FakeWebSocket, gateway_id: str
     ) -> None:
         """Pretend to send the power-off command."""
 
-        self.state_calls.append(f"off:{gateway_id}")
+        self._log("state", f"off:{gateway_id}")
+
+
+@pytest.fixture
+def backend() -> FakeBeanbagBackend:
+    """Return a fresh fake backend for each test."""
+
+    return FakeBeanbagBackend(object())
+
+
+BackendInstaller = Callable[[FakeBeanbagBackend], FakeBeanbagBackend]
+
+
+@pytest.fixture
+def patch_backend(monkeypatch: pytest.MonkeyPatch) -> BackendInstaller:
+    """Return an installer that routes integration setup to a given backend."""
+
+    def install(backend: FakeBeanbagBackend) -> FakeBeanbagBackend:
+        monkeypatch.setattr(
+            securemtr_mod, "async_get_clientsession", lambda hass_obj: backend.session
+        )
+        monkeypatch.setattr(securemtr_mod, "BeanbagBackend", lambda session: backend)
+        return backend
+
+    return install
 
 
-@pytest.mark.asyncio
 async def test_async_run_with_reconnect_retries_operation() -> None:
     """Ensure the reconnect helper retries once after a Beanbag error."""
 
@@ -371,7 +461,7 @@ async def test_async_run_with_reconnect_retries_operation() -> None:
         async def login_and_connect(
             self, email: str, password_digest: str
         ) -> tuple[BeanbagSession, FakeWebSocket]:
-            self.login_calls.append((email, password_digest))
+            self._log("login", (email, password_digest))
             self.websocket = FakeWebSocket()
             return self._session, self.websocket
 
@@ -380,10 +470,7 @@ async def test_async_run_with_reconnect_retries_operation() -> None:
     runtime.session = backend._session
     runtime.websocket = backend.websocket
 
-    entry = DummyConfigEntry(
-        entry_id="reconnect",
-        data={"email": "user@example.com", "password": "digest"},
-    )
+    entry = make_entry("reconnect", unique_id=None, title=None)
 
     first_socket = runtime.websocket
     attempts = 0
@@ -405,13 +492,12 @@ async def test_async_run_with_reconnect_retries_operation() -> None:
 
     assert result == "ok"
     assert attempts == 2
-    assert backend.login_calls == [("user@example.com", "digest")]
+    assert backend.calls["login"] == [("user@example.com", "digest")]
     assert first_socket.close_calls == 1
     assert runtime.websocket is backend.websocket
     assert runtime.websocket.closed is False
 
 
-@pytest.mark.asyncio
 async def test_async_run_with_reconnect_propagates_when_refresh_fails() -> None:
     """Ensure the helper raises the original error if reconnection fails."""
 
@@ -419,7 +505,7 @@ async def test_async_run_with_reconnect_propagates_when_refresh_fails() -> None:
         async def login_and_connect(
             self, email: str, password_digest: str
         ) -> tuple[BeanbagSession, FakeWebSocket]:
-            self.login_calls.append((email, password_digest))
+            self._log("login", (email, password_digest))
             raise BeanbagError("login failed")
 
     backend = FailingBackend(object())
@@ -427,10 +513,7 @@ async def test_async_run_with_reconnect_propagates_when_refresh_fails() -> None:
     runtime.session = backend._session
     runtime.websocket = backend.websocket
 
-    entry = DummyConfigEntry(
-        entry_id="reconnect-fail",
-        data={"email": "user@example.com", "password": "digest"},
-    )
+    entry = make_entry("reconnect-fail", unique_id=None, title=None)
 
     async def _operation(
         backend_obj: FakeBeanbagBackend,
@@ -443,7 +526,7 @@ async def test_async_run_with_reconnect_propagates_when_refresh_fails() -> None:
         await async_run_with_reconnect(entry, runtime, _operation)
 
     assert str(excinfo.value) == "initial failure"
-    assert backend.login_calls == [("user@example.com", "digest")]
+    assert backend.calls["login"] == [("user@example.com", "digest")]
     assert backend.websocket.closed is True
     assert runtime.websocket is None
 
@@ -451,131 +534,142 @@ async def test_async_run_with_reconnect_propagates_when_refresh_fails() -> None:
 class FakeConfigEntries:
     """Mimic Home Assistant's config entries helper."""
 
+    __slots__ = ("forwarded", "unloaded")
+
     def __init__(self) -> None:
-        self.forwarded: list[tuple[str, ...]] = []
-        self.unloaded: list[tuple[str, ...]] = []
+        self.forwarded: list[list[str]] = []
+        self.unloaded: list[list[str]] = []
 
     async def async_forward_entry_setups(
         self, entry: DummyConfigEntry, platforms: list[str]
     ) -> None:
         """Record forwarded platforms."""
 
-        self.forwarded.append(tuple(platforms))
+        self.forwarded.append(platforms)
 
     async def async_unload_platforms(
         self, entry: DummyConfigEntry, platforms: list[str]
     ) -> bool:
         """Record unloaded platforms and report success."""
 
-        self.unloaded.append(tuple(platforms))
+        self.unloaded.append(platforms)
         return True
 
 
 class FakeHass:
     """Emulate the subset of Home Assistant APIs used by the integration."""
 
+    __slots__ = ("data", "_pending", "config_entries", "config")
+
     def __init__(self) -> None:
         self.data: dict[str, dict[str, SecuremtrRuntimeData]] = {}
-        self._tasks: list[asyncio.Task[Any]] = []
+        self._pending: deque[asyncio.Task[Any]] = deque()
         self.config_entries = FakeConfigEntries()
         self.config = SimpleNamespace(time_zone=DEFAULT_TIMEZONE)
 
-    def async_create_task(self, coro: Awaitable[Any]) -> asyncio.Task[Any]:
-        """Schedule a coroutine on the running loop and keep a reference."""
+    def async_create_task(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Task[Any]:
+        """Schedule the coroutine on the running loop and track the task."""
 
         task = asyncio.create_task(coro)
-        self._tasks.append(task)
+        self._pending.append(task)
         return task
 
     async def async_block_till_done(self) -> None:
-        """Await all scheduled tasks to complete."""
+        """Await tracked tasks, including any scheduled while draining."""
+
+        while self._pending:
+            task = self._pending.popleft()
+            with suppress(asyncio.CancelledError):
+                await task
 
-        if not self._tasks:
-            return
-        await asyncio.gather(*self._tasks)
+    @property
+    def last_runtime(self) -> SecuremtrRuntimeData | None:
+        """Return the most recently stored runtime data, if any."""
+
+        runtimes = self.data.get(DOMAIN)
+        if not runtimes:
+            return None
+        return next(reversed(runtimes.values()))
 
     def verify_event_loop_thread(self, _caller: str) -> None:
         """Stub verification hook for dispatcher calls."""
 
 
+def _fake_track_time_change(
+    callbacks: list[tuple],
+    hass: FakeHass,
+    hass_obj: FakeHass,
+    action,
+    *,
+    hour: int | None = None,
+    minute: int | None = None,
+    second: int | None = None,
+):
+    """Record a time-change subscription for the expected hass instance."""
+
+    assert hass_obj is hass
+    callbacks.append((action, hour, minute, second))
+    return lambda: None
+
+
 @pytest.fixture
 def track_time_spy(monkeypatch: pytest.MonkeyPatch):
     """Provide a helper to stub async_track_time_change and capture callbacks."""
 
     def installer(hass: FakeHass) -> list[tuple]:
         callbacks: list[tuple] = []
-
-        def fake_track_time_change(
-            hass_obj: FakeHass,
-            action,
-            *,
-            hour: int | None = None,
-            minute: int | None = None,
-            second: int | None = None,
-        ):
-            assert hass_obj is hass
-            callbacks.append((action, hour, minute, second))
-            return lambda: None
-
         monkeypatch.setattr(
-            "custom_components.securemtr.async_track_time_change",
-            fake_track_time_change,
+            securemtr_mod,
+            "async_track_time_change",
+            functools.partial(_fake_track_time_change, callbacks, hass),
         )
         return callbacks
 
     return installer
 
 
-@pytest.mark.asyncio
+@pytest.mark.parametrize("has_helper", [True, False], ids=["helper", "no_helper"])
 async def test_async_setup_entry_starts_backend(
     monkeypatch: pytest.MonkeyPatch,
     track_time_spy,
     store_instances,
+    backend: FakeBeanbagBackend,
+    has_helper: bool,
+    patch_backend: BackendInstaller,
 ) -> None:
     """Verify that setup schedules the Beanbag login and stores runtime data."""
 
-    fake_metrics = AsyncMock()
-    monkeypatch.setattr(
-        "custom_components.securemtr.consumption_metrics", fake_metrics
-    )
+    metrics_calls: list[tuple[Any, ...]] = []
+
+    async def _fake_metrics(*args: Any) -> None:
+        metrics_calls.append(args)
+
+    monkeypatch.setattr(securemtr_mod, "consumption_metrics", _fake_metrics)
 
     hass = FakeHass()
+    if not has_helper:
+        hass.config_entries = None
     callbacks = track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="1",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-        title="SecureMTR",
-    )
-
-    fake_session = object()
-    backend = FakeBeanbagBackend(fake_session)
+    entry = make_entry("1")
 
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
+    patch_backend(backend)
 
     assert await async_setup_entry(hass, entry)
     await hass.async_block_till_done()
 
-    runtime = hass.data[DOMAIN][entry.entry_id]
+    runtime = hass.last_runtime
     assert runtime.backend is backend
     assert runtime.session is backend._session
     assert runtime.websocket is backend.websocket
     assert runtime.controller is not None
     assert runtime.controller.identifier == "controller-1"
-    assert backend.login_calls == [("user@example.com", "digest")]
-    assert backend.zone_calls == ["gateway-1"]
-    assert backend.schedule_calls == ["gateway-1"]
-    assert backend.metadata_calls == ["gateway-1"]
-    assert backend.configuration_calls == ["gateway-1"]
-    assert backend.state_calls[0] == "gateway-1"
-    assert backend.clock_calls == [("gateway-1", 0)]
+    assert backend.calls["login"] == [("user@example.com", "digest")]
+    assert backend.calls["zone"] == ["gateway-1"]
+    assert backend.calls["schedule"] == ["gateway-1"]
+    assert backend.calls["metadata"] == ["gateway-1"]
+    assert backend.calls["configuration"] == ["gateway-1"]
+    assert backend.calls["state"][0] == "gateway-1"
+    assert backend.calls["clock"] == [("gateway-1", 0)]
     assert runtime.zone_topology == [{"ZN": 1, "ZNM": "Primary"}]
     assert runtime.schedule_overview == {"V": []}
     assert runtime.device_metadata == {
@@ -598,416 +692,201 @@ async def test_async_setup_entry_starts_backend(
     assert runtime.timed_boost_end_time is None
     assert store_instances
     assert runtime.statistics_store is store_instances[0]
-    assert hass.config_entries.forwarded == [
-        ("switch",),
-        ("button", "binary_sensor", "sensor"),
-    ]
+    if has_helper:
+        assert hass.config_entries.forwarded == [
+            ["switch"],
+            ["button", "binary_sensor", "sensor"],
+        ]
     assert callbacks and callbacks[0][1:] == (1, 0, 0)
     callback = callbacks[0][0]
     callback(datetime.now(timezone.utc))
     await hass.async_block_till_done()
-    fake_metrics.assert_called_once_with(hass, entry)
-
-
-@pytest.mark.asyncio
-async def test_async_setup_entry_handles_missing_gateways(
-    monkeypatch: pytest.MonkeyPatch,
-    track_time_spy,
-) -> None:
-    """Ensure controller discovery errors leave the runtime in a safe state."""
-
-    hass = FakeHass()
-    track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="missing-gateway",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-        title="SecureMTR",
-    )
-
-    class NoGatewayBackend(FakeBeanbagBackend):
-        def __init__(self, session: object) -> None:
-            super().__init__(session)
-            self._session = BeanbagSession(
-                user_id=1,
-                session_id="session-id",
-                token="jwt-token",
-                token_timestamp=None,
-                gateways=(),
-            )
-
-    fake_session = object()
-    backend = NoGatewayBackend(fake_session)
-
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
-
-    assert await async_setup_entry(hass, entry)
-    await hass.async_block_till_done()
-
-    runtime = hass.data[DOMAIN][entry.entry_id]
-    assert runtime.controller is None
-    assert runtime.controller_ready.is_set()
-
-
-@pytest.mark.asyncio
-async def test_async_setup_entry_logs_clock_failure(
-    monkeypatch: pytest.MonkeyPatch,
-    track_time_spy,
-) -> None:
-    """Ensure clock sync errors do not abort controller discovery."""
-
-    hass = FakeHass()
-    track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="clock-failure",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-    )
-
-    class ClockErrorBackend(FakeBeanbagBackend):
-        async def sync_gateway_clock(
-            self,
-            session: BeanbagSession,
-            websocket: FakeWebSocket,
-            gateway_id: str,
-            *,
-            timestamp: int | None = None,
-        ) -> None:
-            raise BeanbagError("clock-failed")
-
-    fake_session = object()
-    backend = ClockErrorBackend(fake_session)
-
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
-
-    assert await async_setup_entry(hass, entry)
-    await hass.async_block_till_done()
-
-    runtime = hass.data[DOMAIN][entry.entry_id]
-    assert runtime.controller is not None
-    assert runtime.zone_topology == [{"ZN": 1, "ZNM": "Primary"}]
-
-
-@pytest.mark.asyncio
-async def test_async_setup_entry_logs_metadata_failure(
-    monkeypatch: pytest.MonkeyPatch,
-    track_time_spy,
-) -> None:
-    """Verify Beanbag metadata errors do not crash the startup task."""
-
-    hass = FakeHass()
-    track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="metadata-error",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-        title="SecureMTR",
-    )
-
-    class MetadataFailingBackend(FakeBeanbagBackend):
-        async def read_device_metadata(
-            self, session: BeanbagSession, websocket: FakeWebSocket, gateway_id: str
-        ) -> dict[str, str]:
-            raise BeanbagError("metadata failure")
-
-    fake_session = object()
-    backend = MetadataFailingBackend(fake_session)
-
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
-
-    assert await async_setup_entry(hass, entry)
-    await hass.async_block_till_done()
+    assert metrics_calls == [(hass, entry)]
 
-    runtime = hass.data[DOMAIN][entry.entry_id]
-    assert runtime.controller is None
-    assert runtime.controller_ready.is_set()
-
-
-@pytest.mark.asyncio
-async def test_async_setup_entry_handles_unexpected_metadata_error(
-    monkeypatch: pytest.MonkeyPatch,
-    track_time_spy,
-) -> None:
-    """Ensure unexpected metadata failures are caught and logged."""
-
-    hass = FakeHass()
-    track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="metadata-exception",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-        title="SecureMTR",
-    )
-
-    class ExplodingBackend(FakeBeanbagBackend):
-        async def read_device_metadata(
-            self, session: BeanbagSession, websocket: FakeWebSocket, gateway_id: str
-        ) -> dict[str, str]:
-            raise RuntimeError("boom")
-
-    fake_session = object()
-    backend = ExplodingBackend(fake_session)
 
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
-
-    assert await async_setup_entry(hass, entry)
-    await hass.async_block_till_done()
-
-    runtime = hass.data[DOMAIN][entry.entry_id]
-    assert runtime.controller is None
-    assert runtime.controller_ready.is_set()
+_NO_GATEWAY_SESSION = BeanbagSession(
+    user_id=1,
+    session_id="session-id",
+    token="jwt-token",
+    token_timestamp=None,
+    gateways=(),
+)
 
 
-@pytest.mark.asyncio
-async def test_async_setup_entry_handles_backend_error(
-    monkeypatch: pytest.MonkeyPatch,
+@pytest.mark.parametrize(
+    ("attribute", "value", "has_controller", "connected", "message"),
+    [
+        (
+            "_session",
+            _NO_GATEWAY_SESSION,
+            False,
+            True,
+            "Unable to fetch securemtr controller details",
+        ),
+        (
+            "sync_gateway_clock",
+            BeanbagError("clock-failed"),
+            True,
+            True,
+            "Secure Meters controller clock synchronisation failed",
+        ),
+        (
+            "read_device_metadata",
+            BeanbagError("metadata failure"),
+            False,
+            True,
+            "Unable to fetch securemtr controller details",
+        ),
+        (
+            "read_device_metadata",
+            RuntimeError("boom"),
+            False,
+            True,
+            "Unexpected error while fetching securemtr controller",
+        ),
+        (
+            "login_and_connect",
+            BeanbagError("login failed"),
+            False,
+            False,
+            "Failed to initialize Beanbag backend",
+        ),
+    ],
+    ids=[
+        "missing_gateways",
+        "clock_failure",
+        "metadata_failure",
+        "unexpected_metadata_error",
+        "backend_error",
+    ],
+)
+async def test_async_setup_entry_startup_failures(
+    caplog: pytest.LogCaptureFixture,
     track_time_spy,
+    attribute: str,
+    value: Any,
+    has_controller: bool,
+    connected: bool,
+    message: str,
+    patch_backend: BackendInstaller,
 ) -> None:
-    """Ensure backend failures are caught and do not populate runtime state."""
+    """Ensure startup failures are logged and leave the runtime in a safe state."""
 
     hass = FakeHass()
     track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="2",
-        unique_id="user2@example.com",
-        data={"email": "user2@example.com", "password": "digest"},
-        title="SecureMTR",
-    )
+    entry = make_entry("startup-failure")
 
-    class FailingBackend(FakeBeanbagBackend):
-        async def login_and_connect(self, email: str, password_digest: str):
-            raise BeanbagError("login failed")
+    if isinstance(value, Exception):
+        value = AsyncMock(side_effect=value)
+    backend_cls = type("FailingBackend", (FakeBeanbagBackend,), {attribute: value})
+    backend = backend_cls(object())
+    patch_backend(backend)
 
-    fake_session = object()
-    backend = FailingBackend(fake_session)
+    with caplog.at_level(logging.WARNING, logger="custom_components.securemtr"):
+        assert await async_setup_entry(hass, entry)
+        await hass.async_block_till_done()
 
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
+    assert any(
+        record.name == "custom_components.securemtr"
+        and record.getMessage().startswith(message)
+        for record in caplog.records
     )
 
-    assert await async_setup_entry(hass, entry)
-    await hass.async_block_till_done()
-
-    runtime = hass.data[DOMAIN][entry.entry_id]
-    assert runtime.session is None
-    assert runtime.websocket is None
+    runtime = hass.last_runtime
+    assert (runtime.controller is not None) is has_controller
+    assert (runtime.session is not None) is connected
+    assert (runtime.websocket is not None) is connected
     assert runtime.controller_ready.is_set()
+    if has_controller:
+        assert runtime.zone_topology == [{"ZN": 1, "ZNM": "Primary"}]
 
 
-@pytest.mark.asyncio
+@pytest.mark.parametrize("has_helper", [True, False], ids=["helper", "no_helper"])
 async def test_async_unload_entry_cleans_up(
     monkeypatch: pytest.MonkeyPatch,
     track_time_spy,
+    backend: FakeBeanbagBackend,
+    has_helper: bool,
+    patch_backend: BackendInstaller,
 ) -> None:
     """Confirm unload cancels tasks and closes the websocket."""
 
     hass = FakeHass()
+    if not has_helper:
+        hass.config_entries = None
     track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="3",
+    entry = make_entry(
+        "3",
         unique_id="user3@example.com",
         data={"email": "user3@example.com", "password": "digest"},
-        title="SecureMTR",
     )
 
-    fake_session = object()
-    backend = FakeBeanbagBackend(fake_session)
-
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
+    patch_backend(backend)
 
     assert await async_setup_entry(hass, entry)
     await hass.async_block_till_done()
 
-    runtime = hass.data[DOMAIN][entry.entry_id]
-    # Insert a hanging task to exercise the cancellation path.
-    runtime.startup_task = asyncio.create_task(asyncio.sleep(0.1))
+    runtime = hass.last_runtime
+    # Insert a task that never finishes to exercise the cancellation path.
+    runtime.startup_task = asyncio.create_task(asyncio.Event().wait())
 
     assert await async_unload_entry(hass, entry)
     assert entry.entry_id not in hass.data[DOMAIN]
     assert backend.websocket.close_calls == 1
-    await asyncio.sleep(0)
     assert runtime.startup_task.cancelled()
-    assert hass.config_entries.unloaded == [
-        ("switch", "button", "binary_sensor", "sensor")
-    ]
+    if has_helper:
+        assert hass.config_entries.unloaded == [
+            ["switch", "button", "binary_sensor", "sensor"]
+        ]
 
 
-@pytest.mark.asyncio
 async def test_async_setup_entry_missing_credentials(
     monkeypatch: pytest.MonkeyPatch,
     track_time_spy,
+    backend: FakeBeanbagBackend,
+    patch_backend: BackendInstaller,
 ) -> None:
     """Ensure backend startup short-circuits when credentials are absent."""
 
     hass = FakeHass()
     track_time_spy(hass)
-    entry = DummyConfigEntry(entry_id="4", unique_id="user4@example.com", data={})
+    entry = make_entry("4", unique_id="user4@example.com", data={})
 
-    fake_session = object()
-    backend = FakeBeanbagBackend(fake_session)
-
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
+    patch_backend(backend)
 
     assert await async_setup_entry(hass, entry)
     await hass.async_block_till_done()
 
-    runtime = hass.data[DOMAIN][entry.entry_id]
+    runtime = hass.last_runtime
     assert runtime.session is None
     assert runtime.websocket is None
-    assert backend.login_calls == []
+    assert backend.calls["login"] == []
     assert runtime.controller_ready.is_set()
 
 
-@pytest.mark.asyncio
 async def test_async_unload_entry_without_runtime() -> None:
     """Verify unload succeeds gracefully when runtime data is missing."""
 
     hass = FakeHass()
     hass.data.setdefault(DOMAIN, {})
-    entry = DummyConfigEntry(entry_id="missing", unique_id=None, data={})
+    entry = make_entry("missing", unique_id=None, data={}, title=None)
 
     assert await async_unload_entry(hass, entry)
 
 
-@pytest.mark.asyncio
-async def test_async_setup_entry_without_config_entries_helper(
-    monkeypatch: pytest.MonkeyPatch,
-    track_time_spy,
-) -> None:
-    """Exercise the setup path when Home Assistant lacks the helper attribute."""
-
-    hass = FakeHass()
-    track_time_spy(hass)
-    hass.config_entries = None
-    entry = DummyConfigEntry(
-        entry_id="no-helper",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-        title="SecureMTR",
-    )
-
-    fake_session = object()
-    backend = FakeBeanbagBackend(fake_session)
-
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
-
-    assert await async_setup_entry(hass, entry)
-    await hass.async_block_till_done()
-
-    runtime = hass.data[DOMAIN][entry.entry_id]
-    assert runtime.controller is not None
-    assert runtime.controller_ready.is_set()
-
-
-@pytest.mark.asyncio
-async def test_async_unload_entry_without_config_entries_helper(
-    monkeypatch: pytest.MonkeyPatch,
-    track_time_spy,
-) -> None:
-    """Exercise the unload path when Home Assistant lacks the helper attribute."""
-
-    hass = FakeHass()
-    track_time_spy(hass)
-    hass.config_entries = None
-    entry = DummyConfigEntry(
-        entry_id="no-helper-unload",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-        title="SecureMTR",
-    )
-
-    fake_session = object()
-    backend = FakeBeanbagBackend(fake_session)
-
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
-
-    assert await async_setup_entry(hass, entry)
-    await hass.async_block_till_done()
-
-    assert await async_unload_entry(hass, entry)
-
-
-@pytest.mark.asyncio
 async def test_consumption_metrics_refreshes_history(
     monkeypatch: pytest.MonkeyPatch,
     track_time_spy,
     capture_statistics,
     store_instances,
+    backend: FakeBeanbagBackend,
+    patch_backend: BackendInstaller,
 ) -> None:
     """Ensure consumption metrics refresh reconnects and stores samples."""
 
     hass = FakeHass()
     track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="metrics",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-        title="SecureMTR",
-    )
-
-    fake_session = object()
-    backend = FakeBeanbagBackend(fake_session)
+    entry = make_entry("metrics")
 
     dispatch_calls: list[tuple[object, str]] = []
 
@@ -1018,50 +897,28 @@ async def test_consumption_metrics_refreshes_history(
         "custom_components.securemtr.async_dispatch_runtime_update",
         _capture_dispatch,
     )
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
+
+    patch_backend(backend)
 
     assert await async_setup_entry(hass, entry)
     await hass.async_block_till_done()
 
-    runtime = hass.data[DOMAIN][entry.entry_id]
+    runtime = hass.last_runtime
     runtime.websocket.closed = True
-    initial_logins = len(backend.login_calls)
+    initial_logins = len(backend.calls["login"])
 
     await consumption_metrics(hass, entry)
 
-    assert len(backend.login_calls) == initial_logins + 1
-    assert backend.energy_history_calls == [("gateway-1", 1)]
-    assert backend.program_calls == [("primary", "gateway-1"), ("boost", "gateway-1")]
+    assert len(backend.calls["login"]) == initial_logins + 1
+    assert backend.calls["energy_history"] == [("gateway-1", 1)]
+    assert backend.calls["program"] == [
+        ("primary", "gateway-1"),
+        ("boost", "gateway-1"),
+    ]
 
     tz = dt_util.get_time_zone("Europe/Dublin")
-    base_timestamp = 1_700_000_000
     offsets = range(1, 8)
-    expected_log = []
-    for offset in offsets:
-        epoch = base_timestamp + offset * 86_400
-        report_day = report_day_for_sample(epoch, tz)
-        expected_log.append(
-            {
-                "timestamp": datetime.fromtimestamp(epoch, timezone.utc).isoformat(),
-                "epoch_seconds": epoch,
-                "report_day": report_day.isoformat(),
-                "primary_energy_kwh": 1.0 + offset,
-                "boost_energy_kwh": 0.5 * offset,
-                "primary_scheduled_minutes": 180 + offset * 10,
-                "primary_active_minutes": 120 + offset * 10,
-                "boost_scheduled_minutes": offset * 15,
-                "boost_active_minutes": offset * 5,
-            }
-        )
-
-    assert runtime.consumption_metrics_log == expected_log
+    assert runtime.consumption_metrics_log == _EXPECTED_METRICS_LOG
 
     entry_slug = slugify_identifier(entry.title or entry.entry_id)
     stat_ids = {
@@ -1088,7 +945,7 @@ async def test_consumption_metrics_refreshes_history(
         assert metadata["has_sum"] is True
         assert metadata["mean_type"] is StatisticMeanType.NONE
         for index, entry in enumerate(stats):
-            day = report_day_for_sample(base_timestamp + (index + 1) * 86_400, tz)
+            day = report_day_for_sample(_BASE_TIMESTAMP + (index + 1) * 86_400, tz)
             expected_anchor = safe_anchor_datetime(day, anchor_time, tz)
             assert entry["start"] == expected_anchor
             assert entry["state"] == pytest.approx(values[index])
@@ -1118,7 +975,7 @@ async def test_consumption_metrics_refreshes_history(
         assert metadata["has_sum"] is False
         assert metadata["mean_type"] is StatisticMeanType.ARITHMETIC
         for index, entry in enumerate(stats):
-            day = report_day_for_sample(base_timestamp + (index + 1) * 86_400, tz)
+            day = report_day_for_sample(_BASE_TIMESTAMP + (index + 1) * 86_400, tz)
             expected_anchor = safe_anchor_datetime(day, anchor_time, tz)
             assert entry["start"] == expected_anchor
             assert entry["mean"] == pytest.approx(values[index])
@@ -1141,7 +998,7 @@ async def test_consumption_metrics_refreshes_history(
     assert store_instances and store_instances[0].saved
     persisted = store_instances[0].saved[-1]
     expected_last_day = report_day_for_sample(
-        base_timestamp + offsets[-1] * 86_400, tz
+        _BASE_TIMESTAMP + offsets[-1] * 86_400, tz
     ).isoformat()
     assert persisted["primary"]["last_day"] == expected_last_day
     assert persisted["boost"]["last_day"] == expected_last_day
@@ -1166,40 +1023,27 @@ async def test_consumption_metrics_refreshes_history(
 
     assert dispatch_calls == [(hass, entry.entry_id)]
 
-@pytest.mark.asyncio
+
 async def test_consumption_metrics_skips_processed_days(
     monkeypatch: pytest.MonkeyPatch,
     track_time_spy,
     capture_statistics,
     store_instances,
+    backend: FakeBeanbagBackend,
+    patch_backend: BackendInstaller,
 ) -> None:
     """Ensure repeated refreshes avoid duplicating statistics."""
 
     hass = FakeHass()
     track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="metrics-idempotent",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-        title="SecureMTR",
-    )
+    entry = make_entry("metrics-idempotent")
 
-    fake_session = object()
-    backend = FakeBeanbagBackend(fake_session)
-
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
+    patch_backend(backend)
 
     assert await async_setup_entry(hass, entry)
     await hass.async_block_till_done()
 
-    runtime = hass.data[DOMAIN][entry.entry_id]
+    runtime = hass.last_runtime
     runtime.websocket.closed = True
 
     await consumption_metrics(hass, entry)
@@ -1212,48 +1056,33 @@ async def test_consumption_metrics_skips_processed_days(
     assert not capture_statistics
     assert len(store_instances[0].saved) == first_save_count
     assert runtime.statistics_state == persisted
-    assert len(backend.energy_history_calls) == 2
+    assert len(backend.calls["energy_history"]) == 2
 
 
-@pytest.mark.asyncio
 async def test_consumption_metrics_imports_only_new_days(
     monkeypatch: pytest.MonkeyPatch,
     track_time_spy,
     capture_statistics,
     store_instances,
+    backend: FakeBeanbagBackend,
+    patch_backend: BackendInstaller,
 ) -> None:
     """Ensure only unprocessed days trigger external statistics imports."""
 
     hass = FakeHass()
     track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="metrics-incremental",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-        title="SecureMTR",
-    )
+    entry = make_entry("metrics-incremental")
 
-    fake_session = object()
-    backend = FakeBeanbagBackend(fake_session)
-
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
+    patch_backend(backend)
 
     assert await async_setup_entry(hass, entry)
     await hass.async_block_till_done()
 
-    runtime = hass.data[DOMAIN][entry.entry_id]
+    runtime = hass.last_runtime
     runtime.websocket.closed = True
 
     tz = dt_util.get_time_zone("Europe/Dublin")
-    base_timestamp = 1_700_000_000
-    processed_day = report_day_for_sample(base_timestamp + 4 * 86_400, tz)
+    processed_day = report_day_for_sample(_BASE_TIMESTAMP + 4 * 86_400, tz)
 
     store_instances[0].data = {
         "primary": {"energy_sum": 10.0, "last_day": processed_day.isoformat()},
@@ -1267,7 +1096,7 @@ async def test_consumption_metrics_imports_only_new_days(
     boost_id = "sensor.serial_1_boost_energy_total"
 
     expected_days = [
-        report_day_for_sample(base_timestamp + offset * 86_400, tz)
+        report_day_for_sample(_BASE_TIMESTAMP + offset * 86_400, tz)
         for offset in range(5, 8)
     ]
 
@@ -1294,22 +1123,20 @@ async def test_consumption_metrics_imports_only_new_days(
     assert saved_state["boost"]["last_day"] == expected_days[-1].isoformat()
 
 
-@pytest.mark.asyncio
 async def test_consumption_metrics_honours_start_anchor_strategy(
     monkeypatch: pytest.MonkeyPatch,
     track_time_spy,
     capture_statistics,
     store_instances,
+    backend: FakeBeanbagBackend,
+    patch_backend: BackendInstaller,
 ) -> None:
     """Ensure the start anchor strategy uses schedule boundaries."""
 
     hass = FakeHass()
     track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="metrics-anchors",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-        title="SecureMTR",
+    entry = make_entry(
+        "metrics-anchors",
         options={
             CONF_ANCHOR_STRATEGY: "start",
             CONF_TIME_ZONE: DEFAULT_TIMEZONE,
@@ -1319,22 +1146,12 @@ async def test_consumption_metrics_honours_start_anchor_strategy(
         },
     )
 
-    fake_session = object()
-    backend = FakeBeanbagBackend(fake_session)
-
-    monkeypatch.setattr(
-        "custom_components.securemtr.async_get_clientsession",
-        lambda hass_obj: fake_session,
-    )
-    monkeypatch.setattr(
-        "custom_components.securemtr.BeanbagBackend",
-        lambda session: backend,
-    )
+    patch_backend(backend)
 
     assert await async_setup_entry(hass, entry)
     await hass.async_block_till_done()
 
-    runtime = hass.data[DOMAIN][entry.entry_id]
+    runtime = hass.last_runtime
     runtime.websocket.closed = True
 
     await consumption_metrics(hass, entry)
@@ -1344,8 +1161,7 @@ async def test_consumption_metrics_honours_start_anchor_strategy(
 
     tz = dt_util.get_time_zone(DEFAULT_TIMEZONE)
     assert tz is not None
-    base_timestamp = 1_700_000_000
-    first_day = report_day_for_sample(base_timestamp + 86_400, tz)
+    first_day = report_day_for_sample(_BASE_TIMESTAMP + 86_400, tz)
 
     metadata, primary_stats = capture_statistics[primary_id]
     assert metadata["has_sum"] is True
@@ -1361,7 +1177,7 @@ def test_load_statistics_options_prefers_hass_timezone() -> None:
 
     hass = FakeHass()
     hass.config.time_zone = "Europe/London"
-    entry = DummyConfigEntry(entry_id="tz-pref", data={}, options={})
+    entry = make_entry("tz-pref", unique_id=None, data={}, title=None)
     entry.hass = hass
 
     options = _load_statistics_options(entry)
@@ -1376,7 +1192,7 @@ def test_load_statistics_options_invalid_hass_timezone(
 
     hass = FakeHass()
     hass.config.time_zone = "Mars/Olympus"
-    entry = DummyConfigEntry(entry_id="tz-invalid", data={}, options={})
+    entry = make_entry("tz-invalid", unique_id=None, data={}, title=None)
     entry.hass = hass
 
     with caplog.at_level(logging.WARNING):
@@ -1393,7 +1209,7 @@ def test_load_statistics_options_missing_system_database(
 
     hass = FakeHass()
     hass.config.time_zone = "Mars/Olympus"
-    entry = DummyConfigEntry(entry_id="tz-missing", data={}, options={})
+    entry = make_entry("tz-missing", unique_id=None, data={}, title=None)
     entry.hass = hass
 
     monkeypatch.setattr(
@@ -1413,37 +1229,30 @@ def test_load_statistics_options_missing_system_database(
     assert options.timezone_name == "UTC"
 
 
-@pytest.mark.asyncio
 async def test_consumption_metrics_missing_runtime() -> None:
     """Ensure the helper exits quietly when runtime data is absent."""
 
     hass = FakeHass()
-    entry = DummyConfigEntry(
-        entry_id="missing-runtime",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-    )
+    entry = make_entry("missing-runtime", title=None)
 
     await consumption_metrics(hass, entry)
 
 
-@pytest.mark.asyncio
 async def test_consumption_metrics_missing_credentials(
     monkeypatch: pytest.MonkeyPatch,
+    backend: FakeBeanbagBackend,
 ) -> None:
     """Ensure the helper logs an error when credentials are unavailable."""
 
     hass = FakeHass()
-    runtime = FakeBeanbagBackend(object())
-    data_runtime = SecuremtrRuntimeData(backend=runtime)
+    data_runtime = SecuremtrRuntimeData(backend=backend)
     hass.data.setdefault(DOMAIN, {})["no-creds"] = data_runtime
-    entry = DummyConfigEntry(entry_id="no-creds", unique_id=None, data={})
+    entry = make_entry("no-creds", unique_id=None, data={}, title=None)
 
     await consumption_metrics(hass, entry)
-    assert runtime.login_calls == []
+    assert backend.calls["login"] == []
 
 
-@pytest.mark.asyncio
 async def test_consumption_metrics_login_failure(
     monkeypatch: pytest.MonkeyPatch,
     track_time_spy,
@@ -1452,15 +1261,11 @@ async def test_consumption_metrics_login_failure(
 
     hass = FakeHass()
     track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="login-failure",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-    )
+    entry = make_entry("login-failure", title=None)
 
     class FailingBackend(FakeBeanbagBackend):
         async def login_and_connect(self, email: str, password_digest: str):
-            self.login_calls.append((email, password_digest))
+            self._log("login", (email, password_digest))
             raise BeanbagError("boom")
 
     backend = FailingBackend(object())
@@ -1471,11 +1276,10 @@ async def test_consumption_metrics_login_failure(
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = runtime
 
     await consumption_metrics(hass, entry)
-    assert len(backend.login_calls) == 1
+    assert len(backend.calls["login"]) == 1
     assert runtime.consumption_metrics_log == []
 
 
-@pytest.mark.asyncio
 async def test_consumption_metrics_energy_history_error(
     monkeypatch: pytest.MonkeyPatch,
     track_time_spy,
@@ -1484,11 +1288,7 @@ async def test_consumption_metrics_energy_history_error(
 
     hass = FakeHass()
     track_time_spy(hass)
-    entry = DummyConfigEntry(
-        entry_id="history-error",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-    )
+    entry = make_entry("history-error", title=None)
 
     class HistoryBackend(FakeBeanbagBackend):
         async def read_energy_history(
@@ -1499,37 +1299,27 @@ async def test_consumption_metrics_energy_history_error(
             *,
             window_index: int = 1,
         ) -> list[BeanbagEnergySample]:
-            self.energy_history_calls.append((gateway_id, window_index))
+            self._log("energy_history", (gateway_id, window_index))
             raise BeanbagError("history")
 
     backend = HistoryBackend(object())
     runtime = SecuremtrRuntimeData(backend=backend)
     runtime.session = backend._session
     runtime.websocket = backend.websocket
-    runtime.controller = SecuremtrController(
-        identifier="controller-1",
-        name="E7+",
-        gateway_id="gateway-1",
-    )
+    runtime.controller = _CANNED_CONTROLLER
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = runtime
 
     await consumption_metrics(hass, entry)
-    assert backend.energy_history_calls == [("gateway-1", 1)]
+    assert backend.calls["energy_history"] == [("gateway-1", 1)]
     assert runtime.consumption_metrics_log == []
 
 
-@pytest.mark.asyncio
-async def test_consumption_metrics_missing_connection_objects() -> None:
+async def test_consumption_metrics_missing_connection_objects(backend: FakeBeanbagBackend) -> None:
     """Ensure missing controller metadata aborts the refresh."""
 
     hass = FakeHass()
-    entry = DummyConfigEntry(
-        entry_id="missing-controller",
-        unique_id="user@example.com",
-        data={"email": "user@example.com", "password": "digest"},
-    )
+    entry = make_entry("missing-controller", title=None)
 
-    backend = FakeBeanbagBackend(object())
     runtime = SecuremtrRuntimeData(backend=backend)
     runtime.session = SimpleNamespace()
     runtime.websocket = SimpleNamespace(closed=False)
@@ -1540,16 +1330,11 @@ async def test_consumption_metrics_missing_connection_objects() -> None:
     assert runtime.consumption_metrics_log == []
 
 
-@pytest.mark.asyncio
-async def test_async_fetch_controller_requires_connection() -> None:
+async def test_async_fetch_controller_requires_connection(backend: FakeBeanbagBackend) -> None:
     """Ensure controller fetching rejects missing session data."""
 
-    runtime = SecuremtrRuntimeData(backend=FakeBeanbagBackend(object()))
-    entry = DummyConfigEntry(
-        entry_id="fetch-error",
-        unique_id="user@example.com",
-        data={},
-    )
+    runtime = SecuremtrRuntimeData(backend=backend)
+    entry = make_entry("fetch-error", data={}, title=None)
 
     with pytest.raises(BeanbagError):
         await _async_fetch_controller(entry, runtime)
@@ -1591,12 +1376,7 @@ def test_build_controller_normalises_metadata() -> None:
     """Verify metadata parsing handles blank serial numbers and names."""
 
     metadata = {"BOI": "", "SN": "", "N": None, "FV": 2, "MD": "E7+"}
-    gateway = BeanbagGateway(
-        gateway_id="gateway-1",
-        serial_number=None,
-        host_name="host",
-        capabilities={},
-    )
+    gateway = _BARE_GATEWAY
 
     controller = _build_controller(metadata, gateway)
     assert controller.identifier == "gateway-1"
@@ -1610,12 +1390,7 @@ def test_build_controller_ignores_numeric_name() -> None:
     """Ensure numeric-only metadata names fall back to the default label."""
 
     metadata = {"BOI": "", "SN": "E0031158", "N": 2, "FV": None, "MD": None}
-    gateway = BeanbagGateway(
-        gateway_id="gateway-1",
-        serial_number=None,
-        host_name="host",
-        capabilities={},
-    )
+    gateway = _BARE_GATEWAY
 
     controller = _build_controller(metadata, gateway)
     assert controller.name == "E7+ Smart Water Heater Controller"
@@ -1626,12 +1401,7 @@ def test_build_controller_maps_numeric_model() -> None:
     """Map numeric metadata model codes to friendly names."""
 
     metadata = {"BOI": "controller", "SN": "serial", "N": "Unit", "MD": 2}
-    gateway = BeanbagGateway(
-        gateway_id="gateway-1",
-        serial_number=None,
-        host_name="host",
-        capabilities={},
-    )
+    gateway = _BARE_GATEWAY
 
     controller = _build_controller(metadata, gateway)
     assert controller.model == "E7+ Smart Water Heater Controller"
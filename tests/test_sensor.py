@@ -56,8 +56,7 @@ def _create_runtime() -> SecuremtrRuntimeData:
     return runtime
 
 
-@pytest.mark.asyncio
-async def test_sensor_reports_end_time() -> None:
+async def test_sensor_reports_end_time(monkeypatch: pytest.MonkeyPatch) -> None:
     """Ensure the sensor reports the boost end timestamp when active."""
 
     runtime = _create_runtime()
@@ -97,16 +96,14 @@ async def test_sensor_reports_end_time() -> None:
 
     sensor.async_on_remove = _record_remove  # type: ignore[assignment]
 
-    with pytest.MonkeyPatch.context() as mp:
-        mp.setattr(
-            "custom_components.securemtr.sensor.SensorEntity.async_added_to_hass",
-            _fake_added,
-        )
-        mp.setattr(
-            "custom_components.securemtr.sensor.async_dispatcher_connect",
-            _connect,
-        )
-        await sensor.async_added_to_hass()
+    monkeypatch.setattr(
+        "custom_components.securemtr.sensor.SensorEntity.async_added_to_hass",
+        _fake_added,
+    )
+    monkeypatch.setattr(
+        "custom_components.securemtr.sensor.async_dispatcher_connect", _connect
+    )
+    await sensor.async_added_to_hass()
 
     assert connections[0][0] is sensor.hass
     assert removals
@@ -123,7 +120,6 @@ async def test_sensor_reports_end_time() -> None:
     assert sensor.available is False
 
 
-@pytest.mark.asyncio
 async def test_sensor_requires_controller() -> None:
     """Ensure setup raises when controller metadata is missing."""
 
@@ -136,7 +132,6 @@ async def test_sensor_requires_controller() -> None:
         await async_setup_entry(hass, entry, lambda entities: None)
 
 
-@pytest.mark.asyncio
 async def test_statistics_sensors_report_totals() -> None:
     """Ensure the statistics sensors expose cumulative and daily values."""
 
@@ -226,7 +221,6 @@ async def test_statistics_sensors_report_totals() -> None:
     assert boost_runtime.extra_state_attributes is None
 
 
-@pytest.mark.asyncio
 async def test_sensor_setup_times_out(monkeypatch: pytest.MonkeyPatch) -> None:
     """Ensure setup raises when controller metadata is delayed."""
 
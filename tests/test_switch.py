@@ -93,7 +93,6 @@ def _create_runtime() -> tuple[SecuremtrRuntimeData, DummyBackend]:
     return runtime, backend
 
 
-@pytest.mark.asyncio
 async def test_switch_setup_creates_entity(monkeypatch: pytest.MonkeyPatch) -> None:
     """Ensure the switch platform exposes the controller power switch."""
 
@@ -228,7 +227,6 @@ def test_switch_device_info_without_serial() -> None:
     assert device_info["serial_number"] is None
 
 
-@pytest.mark.asyncio
 async def test_switch_setup_times_out(monkeypatch: pytest.MonkeyPatch) -> None:
     """Verify the platform raises when metadata is not ready in time."""
 
@@ -245,7 +243,6 @@ async def test_switch_setup_times_out(monkeypatch: pytest.MonkeyPatch) -> None:
         await async_setup_entry(hass, entry, lambda entities: None)
 
 
-@pytest.mark.asyncio
 async def test_switch_setup_requires_controller() -> None:
     """Ensure a missing controller raises an explicit error."""
 
@@ -258,7 +255,6 @@ async def test_switch_setup_requires_controller() -> None:
         await async_setup_entry(hass, entry, lambda entities: None)
 
 
-@pytest.mark.asyncio
 async def test_switch_turn_on_requires_connection(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -293,7 +289,6 @@ async def test_switch_turn_on_requires_connection(
     assert backend.on_calls == []
 
 
-@pytest.mark.asyncio
 async def test_switch_turn_on_requires_controller(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -332,7 +327,6 @@ async def test_switch_turn_on_requires_controller(
     assert backend.on_calls == []
 
 
-@pytest.mark.asyncio
 async def test_timed_boost_requires_connection(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -368,7 +362,6 @@ async def test_timed_boost_requires_connection(
     assert backend.timed_boost_calls == []
 
 
-@pytest.mark.asyncio
 async def test_timed_boost_requires_controller(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -407,7 +400,6 @@ async def test_timed_boost_requires_controller(
     assert backend.timed_boost_calls == []
 
 
-@pytest.mark.asyncio
 async def test_timed_boost_backend_error(monkeypatch: pytest.MonkeyPatch) -> None:
     """Convert backend failures into Home Assistant errors for timed boost."""
 
@@ -447,7 +439,6 @@ async def test_timed_boost_backend_error(monkeypatch: pytest.MonkeyPatch) -> Non
     assert runtime.timed_boost_enabled is False
 
 
-@pytest.mark.asyncio
 async def test_switch_turn_on_handles_backend_error(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -495,7 +486,6 @@ def test_slugify_identifier_generates_stable_slug() -> None:
     assert slugify_identifier(" Controller #1 ") == "controller__1"
 
 
-@pytest.mark.asyncio
 async def test_switch_async_added_to_hass(monkeypatch: pytest.MonkeyPatch) -> None:
     """Ensure dispatcher callbacks are registered during entity setup."""
 